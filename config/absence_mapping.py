@@ -5,8 +5,11 @@ This file defines the 17 standard absence types and maps them to column position
 for each of the 4 different Excel formats used across months 01-11.2568.
 """
 
+import re
+from functools import lru_cache
+
 # The 17 standard absence types (order matters - index used for totals array)
-ABSENCE_TYPES = [
+ABSENCE_TYPES = (
     'วันทำงาน',           # 0: Work Days
     'ขาดงาน',             # 1: Absent
     'ลากิจ',              # 2: Personal Leave
@@ -24,10 +27,10 @@ ABSENCE_TYPES = [
     'OT วันหยุด',         # 14: Holiday OT
     'กะดึก',              # 15: Night Shift
     'ควบคุม 2 เครื่อง',    # 16: Multi-Machine
-]
+)
 
 # Column headers for export (Thai + English)
-ABSENCE_COLUMN_HEADERS = [
+ABSENCE_COLUMN_HEADERS = (
     'วันทำงาน (Work Days)',
     'ขาดงาน (Absent)',
     'ลากิจ (Personal Leave)',
@@ -45,7 +48,7 @@ ABSENCE_COLUMN_HEADERS = [
     'OT วันหยุด (Holiday OT)',
     'กะดึก (Night Shift)',
     'ควบคุม 2 เครื่อง (Multi-Machine)'
-]
+)
 
 # Format configurations
 # Each format defines how to extract the 17 absence types from the Excel columns
@@ -161,6 +164,16 @@ FORMAT_CONFIGS = {
 }
 
 
+# Monthly filename pattern and month -> format key lookup, built once at import
+_FILENAME_RE = re.compile(r'^(\d{2})\.2568\.xlsx$')
+_MONTH_TO_FORMAT = {
+    month: format_key
+    for format_key, config in FORMAT_CONFIGS.items()
+    for month in config['files']
+}
+
+
+@lru_cache(maxsize=None)
 def get_format_for_file(filename: str) -> str:
     """
     Determine which format to use based on filename.
@@ -175,15 +188,12 @@ def get_format_for_file(filename: str) -> str:
         ValueError: If no format found for the file
     """
     # Extract month number from filename
-    import re
-    match = re.match(r'^(\d{2})\.2568\.xlsx$', filename)
+    match = _FILENAME_RE.match(filename)
     if not match:
         raise ValueError(f"Invalid filename format: {filename}")
 
     month = match.group(1)
 
-    for format_key, config in FORMAT_CONFIGS.items():
-        if month in config['files']:
-            return format_key
-
-    raise ValueError(f"No format configuration found for month {month}")
+    if month not in _MONTH_TO_FORMAT:
+        raise ValueError(f"No format configuration found for month {month}")
+    return _MONTH_TO_FORMAT[month]
@@ -1,4 +1,4 @@
 # IO utilities
-from .excel_reader import load_excel_file, parse_value
+from .excel_reader import load_excel_file, parse_value, parse_columns, drop_blank_rows, clean_text_column
 
-__all__ = ['load_excel_file', 'parse_value']
+__all__ = ['load_excel_file', 'parse_value', 'parse_columns', 'drop_blank_rows', 'clean_text_column']
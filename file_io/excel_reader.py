@@ -2,22 +2,51 @@
 Excel file reading utilities.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from pandas.api.types import is_numeric_dtype
+from typing import List, Optional
 
+# Prefer the Rust-backed calamine reader when python-calamine is installed;
+# openpyxl stays the fallback so pandas + openpyxl remain sufficient
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
 
-def load_excel_file(filepath: str, skiprows: int = 3) -> pd.DataFrame:
+
+def load_excel_file(
+    filepath: str,
+    skiprows: int = 3,
+    usecols: Optional[List[int]] = None
+) -> pd.DataFrame:
     """
     Load an Excel file with specified header row skip.
 
+    Columns are labelled by their position in the sheet (0, 1, 2, ...),
+    also when only some of them are read, so callers can keep using the
+    column numbers from FORMAT_CONFIGS.
+
+    Uses the calamine engine when available, which parses the sheet in
+    Rust. Otherwise uses openpyxl, which pandas opens in read-only/data-only
+    mode: rows are streamed from the sheet XML instead of building the
+    full workbook in memory. Both read formulas as cached values.
+
     Args:
         filepath: Path to Excel file
         skiprows: Number of rows to skip (default 3 for most formats)
+        usecols: Column positions to read (default: all columns)
 
     Returns:
         pandas DataFrame with the data
     """
-    return pd.read_excel(filepath, skiprows=skiprows)
+    if usecols is not None:
+        usecols = sorted(set(usecols))
+
+    df = pd.read_excel(filepath, skiprows=skiprows, usecols=usecols, engine=_EXCEL_ENGINE)
+    df.columns = usecols if usecols is not None else range(len(df.columns))
+    return df
 
 
 def parse_value(val) -> float:
@@ -36,3 +65,68 @@ def parse_value(val) -> float:
         return float(val)
     except (ValueError, TypeError):
         return 0.0
+
+
+def parse_columns(df: pd.DataFrame, cols: List[int]) -> np.ndarray:
+    """
+    Parse a block of columns to numeric in one vectorized pass.
+
+    Same rules as parse_value: empty cells, dash placeholders and
+    anything non-numeric become 0.
+
+    Args:
+        df: DataFrame from load_excel_file
+        cols: Column positions (labels from load_excel_file) to parse
+
+    Returns:
+        2D float array (rows x len(cols))
+    """
+    matrix = np.empty((len(df), len(cols)), dtype=np.float64)
+    for j, col_idx in enumerate(cols):
+        series = df[col_idx]
+        # Columns pandas already read as numbers only need NaN -> 0
+        if not is_numeric_dtype(series.dtype):
+            numeric = pd.to_numeric(series, errors='coerce')
+            # Text to_numeric rejects (e.g. Thai digits) gets parse_value's float()
+            retry = numeric.isna() & series.notna()
+            if retry.any():
+                numeric = numeric.astype(np.float64)
+                numeric[retry] = series[retry].map(parse_value)
+            series = numeric
+        matrix[:, j] = series.to_numpy(dtype=np.float64, na_value=0.0)
+    return matrix
+
+
+def drop_blank_rows(df: pd.DataFrame, col: int) -> pd.DataFrame:
+    """
+    Keep only rows with a non-empty value in the given column.
+
+    Used to drop blank, spacer and trailing rows (no employee name) before
+    any per-row work.
+
+    Args:
+        df: DataFrame from load_excel_file
+        col: Column position (label from load_excel_file) to check
+
+    Returns:
+        Filtered DataFrame
+    """
+    values = df[col]
+    has_value = values.notna() & values.astype(str).str.strip().ne('')
+    return df[has_value.to_numpy()]
+
+
+def clean_text_column(values: pd.Series) -> List[str]:
+    """
+    Convert a column to stripped strings, with '' for missing cells.
+
+    Vectorized form of ``str(v).strip() if pd.notna(v) else ''``.
+
+    Args:
+        values: Column from load_excel_file
+
+    Returns:
+        List of cleaned strings, one per row
+    """
+    present = values.notna()
+    return values.astype(str).str.strip().where(present, '').tolist()
@@ -5,10 +5,20 @@ from .absence_format_08_09 import AbsenceFormat0809
 from .absence_format_10 import AbsenceFormat10
 from .absence_format_11 import AbsenceFormat11
 
+# Format key -> handler; handlers only read their FORMAT_CONFIGS entry,
+# so one shared instance per format is enough
+FORMAT_HANDLERS = {
+    'A': AbsenceFormat0107(),
+    'B': AbsenceFormat0809(),
+    'C': AbsenceFormat10(),
+    'D': AbsenceFormat11(),
+}
+
 __all__ = [
     'BaseFormatHandler',
     'AbsenceFormat0107',
     'AbsenceFormat0809',
     'AbsenceFormat10',
     'AbsenceFormat11',
+    'FORMAT_HANDLERS',
 ]
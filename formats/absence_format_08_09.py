@@ -13,8 +13,7 @@ from typing import List, Dict, Any
 
 from .base_format import BaseFormatHandler
 from config.absence_mapping import FORMAT_CONFIGS
-from file_io.excel_reader import load_excel_file, parse_value
-from models.employee import extract_name_key_and_notes, extract_nickname
+from file_io.excel_reader import parse_columns, drop_blank_rows
 
 
 class AbsenceFormat0809(BaseFormatHandler):
@@ -30,9 +29,9 @@ class AbsenceFormat0809(BaseFormatHandler):
     def format_name(self) -> str:
         return "Format B (08-09)"
 
-    def extract_employees(self, filepath: str) -> List[Dict[str, Any]]:
+    def extract_from_df(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
-        Extract employee data from Format B Excel file.
+        Extract employee data from Format B sheet.
 
         Uses monthly totals directly from columns 5-23.
         Column mapping:
@@ -54,49 +53,10 @@ class AbsenceFormat0809(BaseFormatHandler):
             [15] Night Shift = col 22
             [16] Multi-Machine = col 23
         """
-        df = load_excel_file(filepath, skiprows=self.config['header_row'])
-        employees = []
+        # Skip rows without a name up front instead of inside the row loop
+        df = drop_blank_rows(df, self.config['name_col'])
 
-        absence_cols = self.config['absence_cols']
+        # Parse the monthly totals block once per file
+        totals_matrix = parse_columns(df, self.config['absence_cols'])
 
-        for _, row in df.iterrows():
-            emp_id = row.iloc[self.config['id_col']]
-            full_name = row.iloc[self.config['name_col']]
-            position = row.iloc[self.config['position_col']]
-            department = row.iloc[self.config['department_col']]
-            pay_type = row.iloc[self.config['paytype_col']]
-
-            # Skip if no name
-            if pd.isna(full_name) or str(full_name).strip() == '':
-                continue
-
-            # Extract key, display name, and notes
-            key, display_name, note = extract_name_key_and_notes(full_name)
-            if not key:
-                continue
-
-            # Clean employee ID
-            emp_id_str = str(emp_id).strip() if pd.notna(emp_id) else ''
-
-            # Extract nickname
-            nickname = extract_nickname(full_name)
-
-            # Extract absence totals from mapped columns
-            monthly_totals = []
-            for col_idx in absence_cols:
-                monthly_totals.append(parse_value(row.iloc[col_idx]))
-
-            employees.append({
-                'primary_key': key,
-                'name_key': key,
-                'emp_id': emp_id_str,
-                'nickname': nickname,
-                'display_name': display_name,
-                'note': note,
-                'position': position,
-                'department': department,
-                'payType': pay_type,
-                'totals': monthly_totals
-            })
-
-        return employees
+        return self._build_records(df, totals_matrix)
@@ -9,13 +9,13 @@ Structure:
 - Multi-machine needs to sum columns 28 + 29
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 
 from .base_format import BaseFormatHandler
 from config.absence_mapping import FORMAT_CONFIGS
-from file_io.excel_reader import load_excel_file, parse_value
-from models.employee import extract_name_key_and_notes, extract_nickname
+from file_io.excel_reader import parse_columns, drop_blank_rows
 
 
 class AbsenceFormat11(BaseFormatHandler):
@@ -31,9 +31,9 @@ class AbsenceFormat11(BaseFormatHandler):
     def format_name(self) -> str:
         return "Format D (11)"
 
-    def extract_employees(self, filepath: str) -> List[Dict[str, Any]]:
+    def extract_from_df(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
-        Extract employee data from Format D Excel file.
+        Extract employee data from Format D sheet.
 
         Same column mapping as Format C, but header row is 4 instead of 3:
             [0] Work Days = col 7
@@ -54,56 +54,18 @@ class AbsenceFormat11(BaseFormatHandler):
             [15] Night Shift = col 27
             [16] Multi-Machine = col 28 + col 29
         """
-        df = load_excel_file(filepath, skiprows=self.config['header_row'])
-        employees = []
+        # Skip rows without a name up front instead of inside the row loop
+        df = drop_blank_rows(df, self.config['name_col'])
 
         absence_cols = self.config['absence_cols']
         multi_machine_cols = self.config['multi_machine_cols']
 
-        for _, row in df.iterrows():
-            emp_id = row.iloc[self.config['id_col']]
-            full_name = row.iloc[self.config['name_col']]
-            position = row.iloc[self.config['position_col']]
-            department = row.iloc[self.config['department_col']]
-            pay_type = row.iloc[self.config['paytype_col']]
+        # Build the whole totals matrix once per file with column remapping
+        direct = [i for i, col_idx in enumerate(absence_cols) if col_idx is not None]
+        totals_matrix = np.zeros((len(df), len(absence_cols)))
+        totals_matrix[:, direct] = parse_columns(df, [absence_cols[i] for i in direct])
 
-            # Skip if no name
-            if pd.isna(full_name) or str(full_name).strip() == '':
-                continue
+        # Multi-machine: sum columns 28 + 29
+        totals_matrix[:, absence_cols.index(None)] = parse_columns(df, multi_machine_cols).sum(axis=1)
 
-            # Extract key, display name, and notes
-            key, display_name, note = extract_name_key_and_notes(full_name)
-            if not key:
-                continue
-
-            # Clean employee ID
-            emp_id_str = str(emp_id).strip() if pd.notna(emp_id) else ''
-
-            # Extract nickname
-            nickname = extract_nickname(full_name)
-
-            # Extract absence totals with column remapping
-            monthly_totals = []
-            for i, col_idx in enumerate(absence_cols):
-                if col_idx is None:
-                    # Multi-machine: sum columns 28 + 29
-                    val = parse_value(row.iloc[multi_machine_cols[0]]) + \
-                          parse_value(row.iloc[multi_machine_cols[1]])
-                else:
-                    val = parse_value(row.iloc[col_idx])
-                monthly_totals.append(val)
-
-            employees.append({
-                'primary_key': key,
-                'name_key': key,
-                'emp_id': emp_id_str,
-                'nickname': nickname,
-                'display_name': display_name,
-                'note': note,
-                'position': position,
-                'department': department,
-                'payType': pay_type,
-                'totals': monthly_totals
-            })
-
-        return employees
+        return self._build_records(df, totals_matrix)
@@ -7,18 +7,45 @@ Each format handler extracts employee absence data from a specific Excel format.
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 
+import numpy as np
+import pandas as pd
+
+from file_io.excel_reader import load_excel_file, clean_text_column
+from models.employee import extract_name_key_and_notes, extract_nickname
+
 
 class BaseFormatHandler(ABC):
     """Abstract base class for Excel format handlers."""
 
-    @abstractmethod
     def extract_employees(self, filepath: str) -> List[Dict[str, Any]]:
         """
         Extract employee data from an Excel file.
 
+        Reads only the columns this format needs; callers that already
+        hold the sheet should use extract_from_df instead.
+
         Args:
             filepath: Path to the Excel file
 
+        Returns:
+            List of employee dictionaries (see extract_from_df)
+        """
+        df = load_excel_file(
+            filepath,
+            skiprows=self.get_format_config()['header_row'],
+            usecols=self.required_columns()
+        )
+        return self.extract_from_df(df)
+
+    @abstractmethod
+    def extract_from_df(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Extract employee data from an already loaded sheet.
+
+        Args:
+            df: DataFrame from load_excel_file, with at least
+                required_columns() (labelled by sheet position)
+
         Returns:
             List of employee dictionaries with keys:
                 - primary_key: Matching key for deduplication
@@ -44,6 +71,76 @@ class BaseFormatHandler(ABC):
         """
         pass
 
+    def required_columns(self) -> List[int]:
+        """
+        Return the sheet columns this format reads.
+
+        Covers the metadata columns plus every absence column, so the
+        reader can skip the rest of the sheet.
+
+        Returns:
+            Sorted list of column positions
+        """
+        config = self.get_format_config()
+        cols = {config[key] for key in ('id_col', 'name_col', 'position_col', 'department_col', 'paytype_col')}
+        for key in ('absence_cols', 'absence_cols_half1', 'absence_cols_half2', 'multi_machine_cols'):
+            cols.update(col for col in config.get(key, []) if col is not None)
+        return sorted(cols)
+
+    def _build_records(self, df: pd.DataFrame, totals_matrix: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Build employee records from a sheet and its per-row totals.
+
+        Shared by every format; only the totals construction differs.
+
+        Args:
+            df: Sheet from load_excel_file, blank-name rows already dropped
+            totals_matrix: Array of shape (len(df), 17), one row per sheet row
+
+        Returns:
+            List of employee dictionaries (see extract_from_df)
+        """
+        config = self.get_format_config()
+        meta_cols = [
+            config['name_col'],
+            config['position_col'],
+            config['department_col'],
+            config['paytype_col'],
+        ]
+
+        # Walk metadata and totals rows together; tolist() converts the whole
+        # matrix to Python floats in one call instead of once per row
+        meta_rows = df[meta_cols].itertuples(index=False, name=None)
+        # Employee IDs are cleaned for the whole column at once
+        emp_ids = clean_text_column(df[config['id_col']])
+
+        employees = []
+        for row, emp_id_str, monthly_totals in zip(meta_rows, emp_ids, totals_matrix.tolist()):
+            full_name, position, department, pay_type = row
+
+            # Extract key, display name, and notes
+            key, display_name, note = extract_name_key_and_notes(full_name)
+            if not key:
+                continue
+
+            # Extract nickname
+            nickname = extract_nickname(full_name)
+
+            employees.append({
+                'primary_key': key,
+                'name_key': key,
+                'emp_id': emp_id_str,
+                'nickname': nickname,
+                'display_name': display_name,
+                'note': note,
+                'position': position,
+                'department': department,
+                'payType': pay_type,
+                'totals': monthly_totals
+            })
+
+        return employees
+
     @property
     @abstractmethod
     def format_name(self) -> str:
@@ -19,21 +19,20 @@ Input: 01.2568.xlsx through 12.2568.xlsx (in current directory)
 Output: absence-summary-2568.xlsx
 """
 
-import glob
 import os
+import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Dict, Any, Optional
 
 import pandas as pd
 
 from config.absence_mapping import get_format_for_file, FORMAT_CONFIGS
-from formats.absence_format_01_07 import AbsenceFormat0107
-from formats.absence_format_08_09 import AbsenceFormat0809
-from formats.absence_format_10 import AbsenceFormat10
-from formats.absence_format_11 import AbsenceFormat11
-from file_io.excel_reader import load_excel_file, parse_value
-from services.aggregator import aggregate_yearly_totals
-from services.master_matcher import apply_master_data
+from formats import FORMAT_HANDLERS
+from file_io.excel_reader import load_excel_file, parse_columns, drop_blank_rows
+from services.aggregator import fold_month, finalize_aggregation
+from services.master_matcher import apply_master_data, load_employee_master
 from services.excel_exporter import (
     create_output_dataframe,
     calculate_summary_stats,
@@ -41,6 +40,10 @@ from services.excel_exporter import (
 )
 
 
+# Monthly input file names (XX.2568.xlsx)
+_MONTHLY_FILE_RE = re.compile(r'[0-1][0-9]\.2568\.xlsx')
+
+
 def find_monthly_files() -> List[str]:
     """
     Find all XX.2568.xlsx files in current directory.
@@ -48,7 +51,8 @@ def find_monthly_files() -> List[str]:
     Returns:
         Sorted list of file paths
     """
-    files = glob.glob('[0-1][0-9].2568.xlsx')
+    with os.scandir('.') as entries:
+        files = [entry.name for entry in entries if _MONTHLY_FILE_RE.fullmatch(entry.name)]
     return sorted(files)
 
 
@@ -64,104 +68,80 @@ def get_format_handler(filename: str):
     """
     format_key = get_format_for_file(filename)
 
-    handlers = {
-        'A': AbsenceFormat0107,
-        'B': AbsenceFormat0809,
-        'C': AbsenceFormat10,
-        'D': AbsenceFormat11,
-    }
-
-    handler_class = handlers.get(format_key)
-    if not handler_class:
+    handler = FORMAT_HANDLERS.get(format_key)
+    if not handler:
         raise ValueError(f"No handler for format {format_key}")
 
-    return handler_class()
+    return handler
+
 
+# Half-month section columns per format, for the traceback sheet.
+# Format B: columns 24-40 are first half, 41-57 are second half
+# (based on actual Format B structure). Formats C/D have no sections.
+_SECTION_COLUMNS = {
+    'A': (FORMAT_CONFIGS['A']['absence_cols_half1'], FORMAT_CONFIGS['A']['absence_cols_half2']),
+    'B': (list(range(24, 41)), list(range(41, 58))),
+}
 
-def process_file(filepath: str) -> Tuple[List[dict], str]:
+
+def process_file(filepath: str) -> Tuple[List[dict], str, Optional[Dict[str, Any]]]:
     """
     Process a single Excel file.
 
+    The sheet is read once, with the columns needed by both the format
+    handler and the section breakdown, and shared by the two.
+
     Args:
         filepath: Path to Excel file
 
     Returns:
-        Tuple of (list of employee dicts, format name)
+        Tuple of (list of employee dicts, format name, section data)
     """
+    format_key = get_format_for_file(filepath)
     handler = get_format_handler(filepath)
-    employees = handler.extract_employees(filepath)
-    return employees, handler.format_name
 
+    usecols = handler.required_columns()
+    for section_cols in _SECTION_COLUMNS.get(format_key, ()):
+        usecols = usecols + section_cols
+    df = load_excel_file(filepath, skiprows=FORMAT_CONFIGS[format_key]['header_row'], usecols=usecols)
+
+    employees = handler.extract_from_df(df)
+    section_data = extract_section_data(df, format_key)
+    return employees, handler.format_name, section_data
 
-def extract_section_data(filepath: str) -> Optional[Dict[str, Any]]:
+
+def extract_section_data(df: pd.DataFrame, format_key: str) -> Optional[Dict[str, Any]]:
     """
     Extract section-level totals from a file for traceback.
 
     Args:
-        filepath: Path to Excel file
+        df: Sheet from load_excel_file, including the section columns
+        format_key: Format of the file ('A'-'D')
 
     Returns:
         Dict with section breakdowns, or None if file has no sections.
         Format A (01-07): {'sections': ['First Half', 'Second Half'], 'section0': [17 totals], 'section1': [17 totals]}
-        Format B (08-09): {'sections': ['Monthly Total', 'First Half', 'Second Half'], ...}
+        Format B (08-09): same layout, from the half-month columns after the monthly totals
         Format C/D: None (no sections)
     """
-    format_key = get_format_for_file(filepath)
-    config = FORMAT_CONFIGS[format_key]
-
-    if format_key == 'A':
-        # Format A: Has two halves
-        df = load_excel_file(filepath, skiprows=config['header_row'])
-        cols_half1 = config['absence_cols_half1']
-        cols_half2 = config['absence_cols_half2']
-
-        half1_totals = [0.0] * 17
-        half2_totals = [0.0] * 17
-
-        for _, row in df.iterrows():
-            # Skip empty rows
-            if pd.isna(row.iloc[config['name_col']]):
-                continue
+    if format_key not in _SECTION_COLUMNS:
+        # Format C/D: No sections
+        return None
 
-            for i in range(17):
-                half1_totals[i] += parse_value(row.iloc[cols_half1[i]])
-                half2_totals[i] += parse_value(row.iloc[cols_half2[i]])
-
-        return {
-            'sections': ['First Half', 'Second Half'],
-            'section0': half1_totals,
-            'section1': half2_totals
-        }
-
-    elif format_key == 'B':
-        # Format B: Has monthly totals + two halves
-        df = load_excel_file(filepath, skiprows=config['header_row'])
-        absence_cols = config['absence_cols']
-
-        # Columns 24-40 are first half, 41-57 are second half
-        # Based on actual Format B structure
-        cols_half1 = [24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40]
-        cols_half2 = [41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57]
-
-        half1_totals = [0.0] * 17
-        half2_totals = [0.0] * 17
-
-        for _, row in df.iterrows():
-            if pd.isna(row.iloc[config['name_col']]):
-                continue
-
-            for i in range(17):
-                half1_totals[i] += parse_value(row.iloc[cols_half1[i]])
-                half2_totals[i] += parse_value(row.iloc[cols_half2[i]])
-
-        return {
-            'sections': ['First Half', 'Second Half'],
-            'section0': half1_totals,
-            'section1': half2_totals
-        }
-
-    # Format C/D: No sections
-    return None
+    config = FORMAT_CONFIGS[format_key]
+    cols_half1, cols_half2 = _SECTION_COLUMNS[format_key]
+
+    # Skip rows without a name (blank or whitespace-only, which calamine
+    # reads as NaN and openpyxl as text), then sum each half as a block
+    named = drop_blank_rows(df, config['name_col'])
+    half1_totals = parse_columns(named, cols_half1).sum(axis=0)
+    half2_totals = parse_columns(named, cols_half2).sum(axis=0)
+
+    return {
+        'sections': ['First Half', 'Second Half'],
+        'section0': half1_totals.tolist(),
+        'section1': half2_totals.tolist()
+    }
 
 
 def main():
@@ -187,28 +167,46 @@ def main():
     section_data_list = []  # Track section breakdowns for traceback
     format_summary = {}
 
+    # Aggregation maps, folded month by month while later files still load
+    id_employee_map = {}
+    name_employee_map = {}
+
     print('\nProcessing files...')
-    for filepath in files:
-        try:
-            employees, format_name = process_file(filepath)
-            all_months_data.append(employees)
-            processed_files.append(filepath)
-
-            # Extract section data for traceback
-            section_data = extract_section_data(filepath)
-            section_data_list.append(section_data)
-
-            # Track format usage
-            if format_name not in format_summary:
-                format_summary[format_name] = []
-            format_summary[format_name].append(filepath)
-
-            print(f'  {filepath}: {len(employees)} employees ({format_name})')
-        except Exception as e:
-            print(f'  ERROR processing {filepath}: {e}')
-            import traceback
-            traceback.print_exc()
-            continue
+    # Files are independent and parsing is CPU-bound, so read them (with
+    # their section breakdowns) in worker processes; results are still
+    # consumed in file order
+    max_workers = min(len(files), os.cpu_count() or 1)
+    master_file = 'employee_master.xlsx'
+    has_master = os.path.exists(master_file)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process_file, filepath) for filepath in files]
+        # The master file only feeds the final matching step, so load it
+        # in the pool too instead of after aggregation
+        master_future = executor.submit(load_employee_master, master_file) if has_master else None
+
+        # Fold each month into the aggregation as soon as its file is parsed
+        for filepath, future in zip(files, futures):
+            try:
+                employees, format_name, section_data = future.result()
+                all_months_data.append(employees)
+                processed_files.append(filepath)
+
+                # Section data for traceback
+                section_data_list.append(section_data)
+
+                # Track format usage
+                if format_name not in format_summary:
+                    format_summary[format_name] = []
+                format_summary[format_name].append(filepath)
+
+                print(f'  {filepath}: {len(employees)} employees ({format_name})')
+            except Exception as e:
+                print(f'  ERROR processing {filepath}: {e}')
+                import traceback
+                traceback.print_exc()
+                continue
+
+            fold_month(id_employee_map, name_employee_map, employees)
 
     if not all_months_data:
         print('ERROR: No data could be processed')
@@ -221,7 +219,7 @@ def main():
 
     # Aggregate
     print(f'\nAggregating {len(all_months_data)} months...')
-    aggregated = aggregate_yearly_totals(all_months_data)
+    aggregated = finalize_aggregation(id_employee_map, name_employee_map)
     print(f'-> {len(aggregated)} unique employees')
 
     # Calculate total raw records
@@ -231,10 +229,11 @@ def main():
 
     # Apply master employee data if available
     match_audit = None
-    master_file = 'employee_master.xlsx'
-    if os.path.exists(master_file):
+    if has_master:
         print(f'\nApplying master employee data from {master_file}...')
-        aggregated, match_audit = apply_master_data(aggregated, master_file)
+        aggregated, match_audit = apply_master_data(
+            aggregated, master_file, master_df=master_future.result()
+        )
     else:
         print(f'\nNote: {master_file} not found - skipping master matching')
 
@@ -244,8 +243,8 @@ def main():
     summary_df = pd.DataFrame(summary_stats)
 
     # Validate: Check for duplicate IDs before export
-    emp_ids = [emp.get('emp_id', '') for emp in aggregated if emp.get('emp_id', '')]
-    duplicate_ids = [emp_id for emp_id in set(emp_ids) if emp_ids.count(emp_id) > 1]
+    id_counts = Counter(emp.get('emp_id', '') for emp in aggregated if emp.get('emp_id', ''))
+    duplicate_ids = [emp_id for emp_id, count in id_counts.items() if count > 1]
     if duplicate_ids:
         print(f'\n⚠ WARNING: {len(duplicate_ids)} duplicate IDs found!')
         for dup_id in sorted(duplicate_ids)[:10]:
@@ -269,7 +268,7 @@ def main():
     print(f'Unique employees: {len(aggregated)}')
     print(f'Records merged: {merged}')
     if match_audit:
-        matched = sum(1 for m in match_audit if m['match_type'] != 'UNMATCHED')
+        matched = sum(1 for m in match_audit if m.match_type != 'UNMATCHED')
         unmatched = len(match_audit) - matched
         print(f'Master matched: {matched}, Unmatched: {unmatched}')
     print(f'\nOutput: absence-summary-2568.xlsx')
@@ -4,11 +4,34 @@ Employee data model and name parsing utilities.
 
 import re
 import pandas as pd
+from functools import lru_cache
 from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass, field
 from typing import List, Set
 
 
+# Compiled once at import; these run for every name in every monthly file
+_SLASH_RE = re.compile(r'/(?=[ก-๙a-zA-Z])')
+_NICK_RE = re.compile(r'\(([ก-๙]+)\)')
+_NICK_SUB_RE = re.compile(r'\s*\([ก-๙]+\)\s*')
+
+# Prefixes written directly against the firstname: (raw, normalized, length)
+# Longest first so 'นางสาว' wins over 'นาง'
+_PREFIXES = (
+    ('นางสาว', 'นางสาว', 6),
+    ('น.ส.', 'นางสาว', 4),  # Normalize to full form
+    ('นส.', 'นางสาว', 3),   # Normalize to full form
+    ('นาง', 'นาง', 3),
+    ('นาย', 'นาย', 3),
+)
+
+# Prefixes written as a separate word
+_PREFIX_SET = frozenset(('นาย', 'นาง', 'นางสาว'))
+
+# Abbreviated prefixes written as a separate word (normalized by normalize_prefix)
+_ABBREVIATED_PREFIX_SET = frozenset(('น.ส.', 'นส.', 'น.ส', 'นส'))
+
+
 @dataclass
 class Employee:
     """
@@ -88,11 +111,15 @@ def extract_name_key_and_notes(full_name: str) -> Tuple[Optional[str], Optional[
     if not full_name or pd.isna(full_name):
         return None, None, None
 
-    full_name = str(full_name).strip()
+    return _parse_name_cached(str(full_name).strip())
+
 
+@lru_cache(maxsize=8192)
+def _parse_name_cached(full_name: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Parse a stripped name string; cached since the same names recur every month."""
     # Extract notes after /
     note = None
-    match = re.search(r'/(?=[ก-๙a-zA-Z])', full_name)
+    match = _SLASH_RE.search(full_name)
     if match:
         note = full_name[match.start()+1:].strip()
         name_part = full_name[:match.start()].strip()
@@ -100,11 +127,11 @@ def extract_name_key_and_notes(full_name: str) -> Tuple[Optional[str], Optional[
         name_part = full_name
 
     # Extract nickname (Thai in parentheses)
-    nick_match = re.search(r'\(([ก-๙]+)\)', name_part)
+    nick_match = _NICK_RE.search(name_part)
     nickname = nick_match.group(1) if nick_match else ''
 
     # Remove nickname from name
-    name_clean = re.sub(r'\s*\([ก-๙]+\)\s*', '', name_part).strip()
+    name_clean = _NICK_SUB_RE.sub('', name_part).strip()
     parts = name_clean.split()
 
     if not parts:
@@ -114,28 +141,22 @@ def extract_name_key_and_notes(full_name: str) -> Tuple[Optional[str], Optional[
 
     # Detect if Thai or Foreign name pattern
     # Check for full prefixes first (with or without space)
-    if first_part in ['นาย', 'นาง', 'นางสาว']:
+    if first_part in _PREFIX_SET:
         # Foreign name: นาง FIRSTNAME LASTNAME [EXTRA...]
         prefix = first_part
         firstname = parts[1] if len(parts) > 1 else ''
         lastname = parts[2] if len(parts) > 2 else ''
     # Check for abbreviated prefixes (e.g., น.ส., นส.)
-    elif first_part in ['น.ส.', 'นส.', 'น.ส', 'นส']:
+    elif first_part in _ABBREVIATED_PREFIX_SET:
         prefix = normalize_prefix(first_part)
         firstname = parts[1] if len(parts) > 1 else ''
         lastname = parts[2] if len(parts) > 2 else ''
     else:
         # Thai name: นายFirstname Lastname or น.ส.Firstname
-        if first_part.startswith('นางสาว'):
-            prefix, firstname = 'นางสาว', first_part[6:]
-        elif first_part.startswith('น.ส.'):
-            prefix, firstname = 'นางสาว', first_part[4:]  # Normalize to full form
-        elif first_part.startswith('นส.'):
-            prefix, firstname = 'นางสาว', first_part[3:]  # Normalize to full form
-        elif first_part.startswith('นาง'):
-            prefix, firstname = 'นาง', first_part[3:]
-        elif first_part.startswith('นาย'):
-            prefix, firstname = 'นาย', first_part[3:]
+        for raw, normalized, length in _PREFIXES:
+            if first_part.startswith(raw):
+                prefix, firstname = normalized, first_part[length:]
+                break
         else:
             prefix, firstname = '', first_part
         lastname = parts[1] if len(parts) > 1 else ''
@@ -168,6 +189,7 @@ def extract_nickname(full_name: str) -> str:
     if not full_name or pd.isna(full_name):
         return ''
 
-    full_name_clean = str(full_name).split('/')[0].strip()
-    nick_match = re.search(r'\(([ก-๙]+)\)', full_name_clean)
+    # Only the part before the first '/' (notes follow it)
+    name_part = str(full_name).partition('/')[0]
+    nick_match = _NICK_RE.search(name_part)
     return nick_match.group(1) if nick_match else ''
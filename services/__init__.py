@@ -1,12 +1,20 @@
 # Services module
-from .aggregator import aggregate_yearly_totals, extract_name_key_and_notes
+from .aggregator import (
+    aggregate_yearly_totals,
+    fold_month,
+    finalize_aggregation,
+    extract_name_key_and_notes
+)
 from .excel_exporter import export_to_excel
-from .master_matcher import apply_master_data, load_employee_master
+from .master_matcher import apply_master_data, load_employee_master, MatchAudit
 
 __all__ = [
     'aggregate_yearly_totals',
+    'fold_month',
+    'finalize_aggregation',
     'extract_name_key_and_notes',
     'export_to_excel',
     'apply_master_data',
-    'load_employee_master'
+    'load_employee_master',
+    'MatchAudit'
 ]
@@ -5,16 +5,23 @@ This module handles deduplication and merging of employee records across months.
 """
 
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 import re
+import numpy as np
 import pandas as pd
 
 
+# Compiled once at import; these run for every record
+_NICK_RE = re.compile(r'\(([ก-๙]+)\)')
+_THAI_SHORT_RE = re.compile(r'^(นาย|นาง|นางสาว)\s+([ก-๙]+)$')
+
+
 def extract_nickname(display_name: str) -> str:
     """Extract Thai nickname from display name."""
     if not display_name:
         return ''
-    match = re.search(r'\(([ก-๙]+)\)', display_name)
+    match = _NICK_RE.search(display_name)
     return match.group(1) if match else ''
 
 
@@ -26,7 +33,7 @@ def extract_thai_only_name(display_name: str) -> str:
     if not display_name:
         return ''
     # Check if this is a short Thai name (prefix + Thai word only)
-    match = re.match(r'^(นาย|นาง|นางสาว)\s+([ก-๙]+)$', display_name.strip())
+    match = _THAI_SHORT_RE.match(display_name.strip())
     if match:
         return match.group(2)  # Return the Thai name part
     return ''
@@ -39,10 +46,8 @@ def nicknames_match(name1: str, name2: str) -> bool:
     - "นาย PISET SAY (เสร็จ)" vs "นาย เสร็จ"
     - Both have same nickname in parentheses
     """
-    nick1 = extract_nickname(name1)
-    nick2 = extract_nickname(name2)
-    thai1 = extract_thai_only_name(name1)
-    thai2 = extract_thai_only_name(name2)
+    nick1, thai1 = _nickname_fields(name1)
+    nick2, thai2 = _nickname_fields(name2)
 
     # Case 1: Both have nicknames and they match
     if nick1 and nick2 and nick1 == nick2:
@@ -61,6 +66,12 @@ def nicknames_match(name1: str, name2: str) -> bool:
     return False
 
 
+@lru_cache(maxsize=8192)
+def _nickname_fields(display_name: str) -> Tuple[str, str]:
+    """Nickname and Thai short name of a display name; cached since names repeat across months."""
+    return extract_nickname(display_name), extract_thai_only_name(display_name)
+
+
 def similarity_ratio(s1: str, s2: str) -> float:
     """
     Calculate string similarity (0-1).
@@ -75,6 +86,34 @@ def similarity_ratio(s1: str, s2: str) -> float:
     return SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
 
 
+def similarity_at_least(s1: str, s2: str, threshold: float) -> bool:
+    """
+    Check whether similarity_ratio(s1, s2) reaches threshold.
+
+    Tries difflib's cheap upper bounds (length-only, then character
+    counts) before the full ratio, so clearly different names are
+    rejected without running the O(n*m) matcher. Same answer as
+    ``similarity_ratio(s1, s2) >= threshold``.
+
+    Args:
+        s1: First string
+        s2: Second string
+        threshold: Minimum similarity (0-1)
+
+    Returns:
+        True if the strings are at least threshold similar
+    """
+    if s1 == s2:
+        return True  # Identical strings score 1.0
+
+    matcher = SequenceMatcher(None, s1.lower(), s2.lower())
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
 def normalize_name_parts(name_str: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Extract and normalize name parts (prefix, firstname, lastname).
@@ -157,6 +196,23 @@ def find_fuzzy_match(
     return None
 
 
+def join_sorted(values: set) -> str:
+    """
+    Join a set of strings as a sorted ' | '-separated string.
+
+    Most sets hold a single value, so sorting is skipped for those.
+
+    Args:
+        values: Set of strings
+
+    Returns:
+        Joined string, or empty string for an empty set
+    """
+    if len(values) <= 1:
+        return next(iter(values), '')
+    return ' | '.join(sorted(values))
+
+
 def aggregate_yearly_totals(all_months_data: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """
     Aggregate absence data using employee ID as primary key.
@@ -179,91 +235,120 @@ def aggregate_yearly_totals(all_months_data: List[List[Dict[str, Any]]]) -> List
     name_employee_map = {}  # name_key -> employee data (for employees without IDs)
 
     for month_data in all_months_data:
-        for emp in month_data:
-            name_key = emp['primary_key']
-            display_name = emp['display_name']
-            emp_id = emp['emp_id'].strip() if emp['emp_id'] else ''
-
-            if emp_id:
-                # Employee has ID - but IDs can be REUSED for different people!
-                # We must verify name or nickname similarity before merging
-                if emp_id in id_employee_map:
-                    existing = id_employee_map[emp_id]
-                    # Check if names are similar enough (85%+ similarity)
-                    name_sim = similarity_ratio(name_key, existing['name_key'])
-
-                    # Also check nickname match - same nickname = same person
-                    # This handles cases like "นาย เสร็จ" vs "นาย PISET SAY (เสร็จ)"
-                    nickname_match = nicknames_match(display_name, existing['name'])
-
-                    if name_sim >= 0.85 or nickname_match:
-                        # Same person - merge into existing record
-                        target = existing
-                        if display_name != target['name'] and display_name not in target['original_names']:
-                            target['merge_reasons'].add(f"ID Merge: {display_name}")
-                    else:
-                        # Different person with reused ID - treat as separate
-                        # Use compound key: emp_id + name_key
-                        compound_key = f"{emp_id}|{name_key}"
-                        if compound_key not in id_employee_map:
-                            id_employee_map[compound_key] = {
-                                'name': display_name,
-                                'name_key': name_key,
-                                'emp_id': emp_id,  # Keep original ID for traceability
-                                'notes': set(),
-                                'original_names': set(),
-                                'merge_reasons': set(),
-                                'position': emp['position'],
-                                'department': emp['department'],
-                                'payType': emp['payType'],
-                                'totals': [0] * 17
-                            }
-                        target = id_employee_map[compound_key]
-                else:
-                    # First time seeing this ID
-                    id_employee_map[emp_id] = {
-                        'name': display_name,
-                        'name_key': name_key,
-                        'emp_id': emp_id,
-                        'notes': set(),
-                        'original_names': set(),
-                        'merge_reasons': set(),
-                        'position': emp['position'],
-                        'department': emp['department'],
-                        'payType': emp['payType'],
-                        'totals': [0] * 17
-                    }
-                    target = id_employee_map[emp_id]
+        fold_month(id_employee_map, name_employee_map, month_data)
+
+    return finalize_aggregation(id_employee_map, name_employee_map)
 
+
+def _new_record(emp: Dict[str, Any], emp_id: str, name_key: str) -> Dict[str, Any]:
+    """
+    Start an aggregated record from the first monthly record seen for it.
+
+    Args:
+        emp: Monthly employee record
+        emp_id: Employee ID to store ('' for name-only records)
+        name_key: Name key to store
+
+    Returns:
+        New aggregated record with empty sets and zero totals
+    """
+    return {
+        'name': emp['display_name'],
+        'name_key': name_key,
+        'emp_id': emp_id,
+        'notes': set(),
+        'original_names': set(),
+        'merge_reasons': set(),
+        'position': emp['position'],
+        'department': emp['department'],
+        'payType': emp['payType'],
+        'totals': np.zeros(17)
+    }
+
+
+def fold_month(
+    id_employee_map: Dict[str, Dict[str, Any]],
+    name_employee_map: Dict[str, Dict[str, Any]],
+    month_data: List[Dict[str, Any]]
+) -> None:
+    """
+    Fold one month of employee records into the aggregation maps (first pass).
+
+    Months must be folded in file order. Callers can fold each month as soon
+    as it is loaded and call finalize_aggregation once all months are in.
+
+    Args:
+        id_employee_map: emp_id (or emp_id|name_key) -> employee data
+        name_employee_map: name_key -> employee data, for records without ID
+        month_data: Employee records from one monthly file
+    """
+    for emp in month_data:
+        name_key = emp['primary_key']
+        display_name = emp['display_name']
+        emp_id = emp['emp_id'].strip() if emp['emp_id'] else ''
+
+        if emp_id:
+            # Employee has ID - but IDs can be REUSED for different people!
+            # We must verify name or nickname similarity before merging
+            if emp_id in id_employee_map:
+                existing = id_employee_map[emp_id]
+                # Check if names are similar enough (85%+ similarity)
+                name_similar = similarity_at_least(name_key, existing['name_key'], 0.85)
+
+                # Also check nickname match - same nickname = same person
+                # This handles cases like "นาย เสร็จ" vs "นาย PISET SAY (เสร็จ)"
+                nickname_match = nicknames_match(display_name, existing['name'])
+
+                if name_similar or nickname_match:
+                    # Same person - merge into existing record
+                    target = existing
+                    if display_name != target['name'] and display_name not in target['original_names']:
+                        target['merge_reasons'].add(f"ID Merge: {display_name}")
+                else:
+                    # Different person with reused ID - treat as separate
+                    # Use compound key: emp_id + name_key
+                    compound_key = f"{emp_id}|{name_key}"
+                    if compound_key not in id_employee_map:
+                        # Keep original ID for traceability
+                        id_employee_map[compound_key] = _new_record(emp, emp_id, name_key)
+                    target = id_employee_map[compound_key]
             else:
-                # No ID - aggregate by exact name only
-                # DISABLED fuzzy matching - it was merging completely different employees
-                # like นาง CHO ZIN with นาย WIN TUN and นาย YE KYAW
-                matched_key = name_key
-
-                if matched_key not in name_employee_map:
-                    name_employee_map[matched_key] = {
-                        'name': display_name,
-                        'name_key': matched_key,
-                        'emp_id': '',
-                        'notes': set(),
-                        'original_names': set(),
-                        'merge_reasons': set(),
-                        'position': emp['position'],
-                        'department': emp['department'],
-                        'payType': emp['payType'],
-                        'totals': [0] * 17
-                    }
-
-                target = name_employee_map[matched_key]
-
-            # Add data to target
-            target['original_names'].add(display_name)
-            if emp['note']:
-                target['notes'].add(emp['note'])
-            for i in range(17):
-                target['totals'][i] += emp['totals'][i]
+                # First time seeing this ID
+                id_employee_map[emp_id] = _new_record(emp, emp_id, name_key)
+                target = id_employee_map[emp_id]
 
+        else:
+            # No ID - aggregate by exact name only
+            # DISABLED fuzzy matching - it was merging completely different employees
+            # like นาง CHO ZIN with นาย WIN TUN and นาย YE KYAW
+            matched_key = name_key
+
+            if matched_key not in name_employee_map:
+                name_employee_map[matched_key] = _new_record(emp, '', matched_key)
+
+            target = name_employee_map[matched_key]
+
+        # Add data to target
+        target['original_names'].add(display_name)
+        if emp['note']:
+            target['notes'].add(emp['note'])
+        target['totals'] += emp['totals']
+
+
+def finalize_aggregation(
+    id_employee_map: Dict[str, Dict[str, Any]],
+    name_employee_map: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Merge same-name records across IDs and build the final employee list.
+
+    Args:
+        id_employee_map: ID-keyed records built by fold_month
+        name_employee_map: Name-keyed records built by fold_month
+
+    Returns:
+        List of aggregated employee dictionaries
+    """
     # Combine both maps
     all_employees = list(id_employee_map.values()) + list(name_employee_map.values())
 
@@ -284,66 +369,30 @@ def aggregate_yearly_totals(all_months_data: List[List[Dict[str, Any]]]) -> List
             new_ids = set(emp['emp_id'].split(' | ')) if emp['emp_id'] else set()
             combined_ids = existing_ids | new_ids
             combined_ids.discard('')  # Remove empty strings
-            existing['emp_id'] = ' | '.join(sorted(combined_ids))
+            existing['emp_id'] = join_sorted(combined_ids)
 
             # Track the merge
             existing['merge_reasons'].add(f"Same Name: {emp['emp_id']} ({emp['name']})")
 
-            # Combine original names
-            if isinstance(emp['original_names'], set):
-                existing['original_names'].update(emp['original_names'])
-            elif emp['original_names']:
-                for n in emp['original_names'].split(' | '):
-                    if n.strip():
-                        existing['original_names'].add(n.strip())
-
-            # Combine notes
-            if isinstance(emp['notes'], set):
-                existing['notes'].update(emp['notes'])
-            elif emp['notes']:
-                for n in emp['notes'].split(' | '):
-                    if n.strip():
-                        existing['notes'].add(n.strip())
+            # Combine original names and notes (fold_month keeps these as
+            # sets until the final join below)
+            existing['original_names'].update(emp['original_names'])
+            existing['notes'].update(emp['notes'])
 
             # Sum totals
-            for i in range(17):
-                existing['totals'][i] += emp['totals'][i]
+            existing['totals'] += emp['totals']
         else:
             # First time seeing this name_key
-            # Ensure sets are preserved for merging
-            if not isinstance(emp['original_names'], set):
-                names_set = set()
-                if emp['original_names']:
-                    for n in emp['original_names'].split(' | '):
-                        if n.strip():
-                            names_set.add(n.strip())
-                emp['original_names'] = names_set
-
-            if not isinstance(emp['notes'], set):
-                notes_set = set()
-                if emp['notes']:
-                    for n in emp['notes'].split(' | '):
-                        if n.strip():
-                            notes_set.add(n.strip())
-                emp['notes'] = notes_set
-
-            if not isinstance(emp['merge_reasons'], set):
-                reasons_set = set()
-                if emp['merge_reasons']:
-                    for r in emp['merge_reasons'].split(' | '):
-                        if r.strip():
-                            reasons_set.add(r.strip())
-                emp['merge_reasons'] = reasons_set
-
             name_key_map[name_key] = emp
 
     all_employees = list(name_key_map.values())
 
-    # Convert sets to strings
+    # Convert sets to strings and totals back to plain lists
     for emp in all_employees:
-        emp['notes'] = ' | '.join(sorted(emp['notes'])) if emp['notes'] else ''
-        emp['original_names'] = ' | '.join(sorted(emp['original_names'])) if emp['original_names'] else ''
-        emp['merge_reasons'] = ' | '.join(sorted(emp['merge_reasons'])) if emp['merge_reasons'] else ''
+        emp['totals'] = emp['totals'].tolist()
+        emp['notes'] = join_sorted(emp['notes'])
+        emp['original_names'] = join_sorted(emp['original_names'])
+        emp['merge_reasons'] = join_sorted(emp['merge_reasons'])
 
     # Sort by employee ID first, then by name
     return sorted(all_employees, key=lambda x: (x['emp_id'] == '', x['emp_id'], x['name']))
@@ -10,12 +10,68 @@ Creates 6 sheets:
 6. Employees - Complete detailed data
 """
 
+import re
+
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment, PatternFill, Font
+from openpyxl.styles import Alignment, PatternFill, Font, Border, Side
 
 from config.absence_mapping import ABSENCE_COLUMN_HEADERS
+from services.master_matcher import MatchAudit
+
+
+# Cell styles for the exported sheets
+_LEFT_ALIGNMENT = Alignment(horizontal='left', vertical='center', wrap_text=True)
+_CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+_REGULAR_FONT = Font(size=11)
+_BOLD_FONT = Font(bold=True, size=12)
+_ROW_BOLD_FONT = Font(bold=True, size=11)
+_RED_BOLD_FONT = Font(color='FF0000', bold=True, size=12)
+_SECTION_HEADER_FONT = Font(bold=True, size=12, color='000000')
+_SECTION_HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+_GREEN_FILL = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+_YELLOW_FILL = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
+_RED_FILL = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+
+# Header cell formatting pandas' to_excel applied: bold with a thin border
+_TO_EXCEL_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(
+    left=Side(style='thin'), right=Side(style='thin'),
+    top=Side(style='thin'), bottom=Side(style='thin')
+)
+
+# Cell styles as (alignment, font, fill); None leaves the workbook default.
+# Cells share these objects, which openpyxl stores once per workbook
+_LEFT_STYLE = (_LEFT_ALIGNMENT, None, None)
+_CENTER_STYLE = (_CENTER_ALIGNMENT, None, None)
+_LEFT_REGULAR_STYLE = (_LEFT_ALIGNMENT, _REGULAR_FONT, None)
+_SECTION_HEADER_STYLE = (_LEFT_ALIGNMENT, _SECTION_HEADER_FONT, _SECTION_HEADER_FILL)
+_HEADER_STYLE = (_CENTER_ALIGNMENT, _BOLD_FONT, None)
+_TO_EXCEL_HEADER_STYLE = (_CENTER_ALIGNMENT, _TO_EXCEL_HEADER_FONT, None)
+_CENTER_REGULAR_STYLE = (_CENTER_ALIGNMENT, _REGULAR_FONT, None)
+_WARNING_STYLE = (_CENTER_ALIGNMENT, _RED_BOLD_FONT, None)
+_RED_BOLD_ROW_STYLE = (_CENTER_ALIGNMENT, _ROW_BOLD_FONT, _RED_FILL)
+_RED_ROW_STYLE = (_CENTER_ALIGNMENT, _REGULAR_FONT, _RED_FILL)
+_YELLOW_ROW_STYLE = (_CENTER_ALIGNMENT, _REGULAR_FONT, _YELLOW_FILL)
+_GREEN_ROW_STYLE = (_CENTER_ALIGNMENT, _REGULAR_FONT, _GREEN_FILL)
+
+# Note keywords flagged on the Suspicious sheet
+_NOTE_KEYWORD_RE = re.compile('ลาออก|เริ่มใหม่|ย้ายมา')
+
+# Master Match row style by Match Type
+_MATCH_TYPE_STYLES = {
+    'UNMATCHED': _RED_ROW_STYLE,
+    'Fuzzy': _YELLOW_ROW_STYLE,
+    'ID': _GREEN_ROW_STYLE,
+    'Name': _GREEN_ROW_STYLE,
+}
 
 
 def create_output_dataframe(aggregated_data: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -36,22 +92,88 @@ def create_output_dataframe(aggregated_data: List[Dict[str, Any]]) -> pd.DataFra
         'ตำแหน่ง (Position)',
         'แผนก (Department)',
         'ประเภท (PayType)',
-    ] + ABSENCE_COLUMN_HEADERS
+        *ABSENCE_COLUMN_HEADERS,
+    ]
+
+    # Build column by column: one list per metadata field, and the absence
+    # columns as slices of a single (n, 17) float array
+    data = {
+        'รหัส (EmpID)': [emp['emp_id'] for emp in aggregated_data],
+        'ชื่อ-สกุล (Name)': [emp['name'] for emp in aggregated_data],
+        'ชื่อเต็ม (Master)': [emp.get('master_full_name', '') for emp in aggregated_data],
+        'หมายเหตุ (Notes)': [emp['notes'] for emp in aggregated_data],
+        'ตำแหน่ง (Position)': [emp['position'] for emp in aggregated_data],
+        'แผนก (Department)': [emp['department'] for emp in aggregated_data],
+        'ประเภท (PayType)': [emp['payType'] for emp in aggregated_data],
+    }
+    matrix = totals_matrix(aggregated_data)
+    for i, header in enumerate(ABSENCE_COLUMN_HEADERS):
+        data[header] = matrix[:, i]
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def totals_matrix(records: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Stack the 17 absence totals of employee records into one array.
+
+    Args:
+        records: Employee dicts (monthly or aggregated) with 'totals'
+
+    Returns:
+        Float array of shape (len(records), 17)
+    """
+    # Flatten straight into one float buffer (no per-record intermediate lists)
+    flat = np.fromiter(chain.from_iterable(emp['totals'] for emp in records), dtype=np.float64)
+    return flat.reshape(-1, 17)
+
+
+def sum_totals(records: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Sum the 17 absence totals over a list of employee records.
+
+    Args:
+        records: Employee dicts (monthly or aggregated) with 'totals'
+
+    Returns:
+        Array of 17 column totals
+    """
+    return totals_matrix(records).sum(axis=0)
+
+
+def month_employee_ids(all_months_data: List[List[Dict[str, Any]]]) -> List[List[str]]:
+    """
+    Get the stripped employee ID of every monthly record.
+
+    Args:
+        all_months_data: Raw monthly data
+
+    Returns:
+        One list of IDs per month, parallel to the month's records
+    """
+    return [
+        [emp.get('emp_id', '').strip() for emp in month_data]
+        for month_data in all_months_data
+    ]
 
-    rows = []
-    for emp in aggregated_data:
-        row = [
-            emp['emp_id'],
-            emp['name'],
-            emp.get('master_full_name', ''),
-            emp['notes'],
-            emp['position'],
-            emp['department'],
-            emp['payType']
-        ] + emp['totals']
-        rows.append(row)
 
-    return pd.DataFrame(rows, columns=columns)
+def _summary_row(file_label: str, section: str, totals: Sequence[float]) -> Dict[str, Any]:
+    """
+    Build one Data Traceback row.
+
+    Uses the Thai column names (same as Employees sheet) for consistency.
+
+    Args:
+        file_label: Value of the File column
+        section: Value of the Section column
+        totals: 17 absence totals, in ABSENCE_COLUMN_HEADERS order
+
+    Returns:
+        Row dict keyed by column name
+    """
+    row = {'File': file_label, 'Section': section}
+    row.update(zip(ABSENCE_COLUMN_HEADERS, totals))
+    return row
 
 
 def calculate_summary_stats(
@@ -80,47 +202,25 @@ def calculate_summary_stats(
         section_data = [None] * len(all_months_data)
 
     # Calculate per-file totals for each absence type
-    file_totals = []
-    for month_data in all_months_data:
-        totals = [0.0] * 17
-        for emp in month_data:
-            for i in range(17):
-                totals[i] += emp['totals'][i]
-        file_totals.append(totals)
+    file_totals = [sum_totals(month_data) for month_data in all_months_data]
 
     # Calculate raw totals (sum of all files)
-    raw_totals = [0.0] * 17
-    for totals in file_totals:
-        for i in range(17):
-            raw_totals[i] += totals[i]
+    raw_totals = np.sum(file_totals, axis=0) if file_totals else np.zeros(17)
 
     # Calculate aggregated totals
-    aggregated_totals = [0.0] * 17
-    for emp in aggregated_data:
-        for i in range(17):
-            aggregated_totals[i] += emp['totals'][i]
-
-    # Use Thai column names (same as Employees sheet) for consistency
-    col_names = ABSENCE_COLUMN_HEADERS
+    aggregated_totals = sum_totals(aggregated_data)
 
     rows = []
 
     # Header row info
     total_raw_records = sum(len(month) for month in all_months_data)
     total_merged_employees = len(aggregated_data)
-    records_merged = total_raw_records - total_merged_employees
 
     # TOTAL row (aggregated output)
-    total_row = {'File': 'TOTAL (Output)', 'Section': f'{total_merged_employees} employees'}
-    for i, name in enumerate(col_names):
-        total_row[name] = aggregated_totals[i]
-    rows.append(total_row)
+    rows.append(_summary_row('TOTAL (Output)', f'{total_merged_employees} employees', aggregated_totals))
 
     # RAW TOTAL row (before merging)
-    raw_row = {'File': 'RAW TOTAL', 'Section': f'{total_raw_records} records'}
-    for i, name in enumerate(col_names):
-        raw_row[name] = raw_totals[i]
-    rows.append(raw_row)
+    rows.append(_summary_row('RAW TOTAL', f'{total_raw_records} records', raw_totals))
 
     # Empty separator row
     rows.append({'File': '', 'Section': ''})
@@ -131,41 +231,34 @@ def calculate_summary_stats(
 
         if sec and sec.get('sections'):
             # File has sections - show file total first
-            file_row = {'File': fname, 'Section': 'Total'}
-            for i, name in enumerate(col_names):
-                file_row[name] = file_totals[f_idx][i]
-            rows.append(file_row)
+            rows.append(_summary_row(fname, 'Total', file_totals[f_idx]))
 
             # Then show each section
             for s_idx, section_name in enumerate(sec['sections']):
                 section_key = f'section{s_idx}'
                 if section_key in sec:
-                    sec_row = {'File': '', 'Section': section_name}
-                    for i, name in enumerate(col_names):
-                        sec_row[name] = sec[section_key][i]
-                    rows.append(sec_row)
+                    rows.append(_summary_row('', section_name, sec[section_key]))
         else:
             # No sections - single row
-            file_row = {'File': fname, 'Section': '-'}
-            for i, name in enumerate(col_names):
-                file_row[name] = file_totals[f_idx][i]
-            rows.append(file_row)
+            rows.append(_summary_row(fname, '-', file_totals[f_idx]))
 
     return rows
 
 
 def create_master_match_sheet(
-    match_audit: List[Dict[str, Any]],
+    match_audit: List[MatchAudit],
     all_months_data: List[List[Dict[str, Any]]] = None,
-    file_names: List[str] = None
+    file_names: List[str] = None,
+    month_emp_ids: Optional[List[List[str]]] = None
 ) -> pd.DataFrame:
     """
     Create audit sheet showing how employees were matched to master data.
 
     Args:
-        match_audit: List of match audit records
+        match_audit: MatchAudit entries from apply_master_data
         all_months_data: Raw monthly data to find last appearance
         file_names: List of source file names
+        month_emp_ids: month_employee_ids(all_months_data), if already built
 
     Returns:
         DataFrame with match audit trail
@@ -182,19 +275,17 @@ def create_master_match_sheet(
         }])
 
     # Build lookup for employee appearances across months
-    emp_months = {}  # emp_id -> list of (month_idx, note from that month)
-    emp_all_notes = {}  # emp_id -> all notes collected
+    emp_months = defaultdict(list)  # emp_id -> list of month indexes
+    emp_all_notes = defaultdict(set)  # emp_id -> all notes collected
     if all_months_data:
-        for month_idx, month_data in enumerate(all_months_data):
-            for emp in month_data:
-                emp_id = emp.get('emp_id', '').strip()
+        if month_emp_ids is None:
+            month_emp_ids = month_employee_ids(all_months_data)
+        for month_idx, (month_data, emp_ids) in enumerate(zip(all_months_data, month_emp_ids)):
+            for emp, emp_id in zip(month_data, emp_ids):
                 if emp_id:
-                    if emp_id not in emp_months:
-                        emp_months[emp_id] = []
-                        emp_all_notes[emp_id] = set()
                     emp_months[emp_id].append(month_idx)
                     # Collect any notes from source
-                    note = emp.get('note', '')
+                    note = emp.get('note')
                     if note:
                         emp_all_notes[emp_id].add(str(note))
 
@@ -203,11 +294,11 @@ def create_master_match_sheet(
         confidence_str = ''
         note_parts = []
 
-        orig_id = match.get('original_id', '')
-        orig_name = match.get('original_name', '') or ''
-        orig_notes = match.get('original_notes', '') or ''
+        orig_id = match.original_id
+        orig_name = match.original_name or ''
+        orig_notes = match.original_notes or ''
 
-        if match['match_type'] == 'UNMATCHED':
+        if match.match_type == 'UNMATCHED':
             confidence_str = '❌ Not Found'
 
             # Check if employee resigned/left (in name or notes)
@@ -230,17 +321,17 @@ def create_master_match_sheet(
                     if sn and sn not in orig_notes:
                         note_parts.append(sn)
 
-        elif match['match_type'] == 'Fuzzy':
-            confidence_str = f"⚠ {match['confidence']:.0%}"
+        elif match.match_type == 'Fuzzy':
+            confidence_str = f"⚠ {match.confidence:.0%}"
         else:
-            confidence_str = f"✓ {match['confidence']:.0%}"
+            confidence_str = f"✓ {match.confidence:.0%}"
 
         rows.append({
-            'Master ID': match['master_id'],
-            'Master Name': match['master_name'],
-            'Original ID': match['original_id'],
-            'Original Name': match['original_name'],
-            'Match Type': match['match_type'],
+            'Master ID': match.master_id,
+            'Master Name': match.master_name,
+            'Original ID': match.original_id,
+            'Original Name': match.original_name,
+            'Match Type': match.match_type,
             'Confidence': confidence_str,
             'Note': ' | '.join(note_parts) if note_parts else ''
         })
@@ -262,43 +353,48 @@ def create_suspicious_sheet(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with flagged records
     """
-    suspicious_records = []
-
-    for idx, row in df.iterrows():
-        emp_id = row['รหัส (EmpID)']
-        name = row['ชื่อ-สกุล (Name)']
-        master_name = row.get('ชื่อเต็ม (Master)', '')
-        notes = row['หมายเหตุ (Notes)']
-
-        # Flag 1: Multiple IDs (job change)
-        flag_multiple_ids = '⚠ YES' if (emp_id and '|' in str(emp_id)) else ''
-
-        # Flag 2: Name has "/" in it (incomplete merging)
-        flag_merged_name = '⚠ YES' if (name and '/' in str(name)) else ''
-
-        # Flag 3: Has notes about ลาออก (quit)
-        flag_quit = '⚠ YES' if (notes and 'ลาออก' in str(notes)) else ''
-
-        # Flag 4: Has notes about เริ่มใหม่ (restarted)
-        flag_restart = '⚠ YES' if (notes and 'เริ่มใหม่' in str(notes)) else ''
-
-        # Flag 5: Has notes about ย้ายมา (transferred in)
-        flag_transfer = '⚠ YES' if (notes and 'ย้ายมา' in str(notes)) else ''
-
-        # Add to suspicious list if any flags
-        if any([flag_multiple_ids, flag_merged_name, flag_quit, flag_restart, flag_transfer]):
-            suspicious_records.append({
-                'รหัส (ID)': emp_id,
-                'ชื่อ-สกุล (Name)': name,
-                'Multiple IDs?': flag_multiple_ids,
-                'Merged Name?': flag_merged_name,
-                'Quit (ลาออก)?': flag_quit,
-                'Restart (เริ่มใหม่)?': flag_restart,
-                'Transfer (ย้ายมา)?': flag_transfer,
-                'หมายเหตุ (Notes)': notes
-            })
-
-    return pd.DataFrame(suspicious_records)
+    emp_ids = df['รหัส (EmpID)']
+    names = df['ชื่อ-สกุล (Name)']
+    notes = df['หมายเหตุ (Notes)']
+
+    # Flag 1: Multiple IDs (job change)
+    multiple_ids = emp_ids.astype(str).str.contains('|', regex=False, na=False).to_numpy()
+
+    # Flag 2: Name has "/" in it (incomplete merging)
+    merged_name = names.astype(str).str.contains('/', regex=False, na=False).to_numpy()
+
+    # Most notes are empty or unrelated: find notes with any keyword in one
+    # pass, then check the individual keywords on those rows only
+    has_keyword = notes.astype(str).str.contains(_NOTE_KEYWORD_RE, na=False).to_numpy()
+    keyword_notes = notes[has_keyword].astype(str)
+
+    # Flag 3: Has notes about ลาออก (quit)
+    quit_ = has_keyword.copy()
+    quit_[has_keyword] = keyword_notes.str.contains('ลาออก', regex=False).to_numpy()
+
+    # Flag 4: Has notes about เริ่มใหม่ (restarted)
+    restart = has_keyword.copy()
+    restart[has_keyword] = keyword_notes.str.contains('เริ่มใหม่', regex=False).to_numpy()
+
+    # Flag 5: Has notes about ย้ายมา (transferred in)
+    transfer = has_keyword.copy()
+    transfer[has_keyword] = keyword_notes.str.contains('ย้ายมา', regex=False).to_numpy()
+
+    # Keep records with any flag
+    flagged = multiple_ids | merged_name | quit_ | restart | transfer
+    if not flagged.any():
+        return pd.DataFrame([])
+
+    return pd.DataFrame({
+        'รหัส (ID)': emp_ids.to_numpy()[flagged],
+        'ชื่อ-สกุล (Name)': names.to_numpy()[flagged],
+        'Multiple IDs?': np.where(multiple_ids[flagged], '⚠ YES', ''),
+        'Merged Name?': np.where(merged_name[flagged], '⚠ YES', ''),
+        'Quit (ลาออก)?': np.where(quit_[flagged], '⚠ YES', ''),
+        'Restart (เริ่มใหม่)?': np.where(restart[flagged], '⚠ YES', ''),
+        'Transfer (ย้ายมา)?': np.where(transfer[flagged], '⚠ YES', ''),
+        'หมายเหตุ (Notes)': notes.to_numpy()[flagged],
+    })
 
 
 def create_executive_summary(
@@ -342,13 +438,18 @@ def create_executive_summary(
     # [SECTION 2: WORKFORCE OVERVIEW]
     summary.append({'Metric': '[WORKFORCE OVERVIEW]', 'Value': ''})
 
-    work_days_total = sum(emp['totals'][0] for emp in aggregated_data)
+    absence_totals = sum_totals(aggregated_data)
+
+    work_days_total = absence_totals[0]
     summary.append({'Metric': 'Total Work Days', 'Value': int(work_days_total)})
 
     total_suspicious = len(suspicious_df)
-    multiple_ids = (suspicious_df['Multiple IDs?'] == '⚠ YES').sum() if len(suspicious_df) > 0 else 0
-    quits = (suspicious_df['Quit (ลาออก)?'] == '⚠ YES').sum() if len(suspicious_df) > 0 else 0
-    transfers = (suspicious_df['Transfer (ย้ายมา)?'] == '⚠ YES').sum() if len(suspicious_df) > 0 else 0
+    if len(suspicious_df) > 0:
+        # Count all three flags in one comparison over the column block
+        flag_cols = ['Multiple IDs?', 'Quit (ลาออก)?', 'Transfer (ย้ายมา)?']
+        multiple_ids, quits, transfers = (suspicious_df[flag_cols] == '⚠ YES').sum()
+    else:
+        multiple_ids = quits = transfers = 0
 
     summary.append({'Metric': 'Employees Requiring Review', 'Value': total_suspicious})
     summary.append({'Metric': '  └─ Job Changes (Multiple IDs)', 'Value': int(multiple_ids)})
@@ -359,11 +460,6 @@ def create_executive_summary(
     # [SECTION 3: TOP ABSENCE CATEGORIES]
     summary.append({'Metric': '[TOP ABSENCE CATEGORIES]', 'Value': ''})
 
-    absence_totals = [0] * 17
-    for emp in aggregated_data:
-        for i in range(17):
-            absence_totals[i] += emp['totals'][i]
-
     absence_list = [(ABSENCE_COLUMN_HEADERS[i], absence_totals[i], i) for i in range(17)]
     absence_list = [x for x in absence_list if x[1] > 0]
     absence_list.sort(key=lambda x: x[1], reverse=True)
@@ -380,16 +476,16 @@ def create_executive_summary(
     # [SECTION 4: DEPARTMENT CONCENTRATION]
     summary.append({'Metric': '[DEPARTMENT CONCENTRATION (TOP 5)]', 'Value': ''})
 
-    dept_counts = {}
+    dept_counts = Counter()
     for emp in aggregated_data:
         dept = emp.get('department', '')
         # Handle empty/None/NaN department values
         if not dept or (isinstance(dept, float) and pd.isna(dept)):
             dept = '(ไม่ระบุแผนก / Unknown Dept)'
-        dept_counts[dept] = dept_counts.get(dept, 0) + 1
+        dept_counts[dept] += 1
 
-    top_depts = sorted(dept_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    other_count = sum(count for _, count in sorted(dept_counts.items(), key=lambda x: x[1], reverse=True)[5:])
+    top_depts = dept_counts.most_common(5)
+    other_count = sum(dept_counts.values()) - sum(count for _, count in top_depts)
 
     for dept_name, count in top_depts:
         pct = (count / total_employees * 100)
@@ -446,7 +542,8 @@ def create_executive_summary(
 def create_merged_names_sheet(
     df: pd.DataFrame,
     aggregated_data: List[Dict[str, Any]],
-    all_months_data: List[List[Dict[str, Any]]]
+    all_months_data: List[List[Dict[str, Any]]],
+    month_emp_ids: Optional[List[List[str]]] = None
 ) -> pd.DataFrame:
     """
     Create sheet showing ALL merged employees - by ID or by name algorithm.
@@ -455,6 +552,7 @@ def create_merged_names_sheet(
         df: Employee DataFrame
         aggregated_data: Aggregated employee data
         all_months_data: Raw monthly data
+        month_emp_ids: month_employee_ids(all_months_data), if already built
 
     Returns:
         DataFrame with merged employee audit trail
@@ -462,6 +560,15 @@ def create_merged_names_sheet(
     merged_list = []
 
     month_labels = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    # Column label per input month, built once for all rows
+    labels = [
+        month_labels[m_idx] if m_idx < len(month_labels) else f'M{m_idx+1}'
+        for m_idx in range(len(all_months_data))
+    ]
+
+    # Per-month ID index, built once on the first merged employee so runs
+    # without merges skip the scan over all monthly records
+    month_id_counts = None
 
     for emp in aggregated_data:
         emp_id = emp.get('emp_id', '')
@@ -474,16 +581,19 @@ def create_merged_names_sheet(
         has_fuzzy_merge = bool(merge_reasons)
 
         if has_multiple_ids or has_multiple_names or has_fuzzy_merge:
-            ids_list = [id_str.strip() for id_str in str(emp_id).split('|')] if emp_id else []
+            if month_id_counts is None:
+                if month_emp_ids is None:
+                    month_emp_ids = month_employee_ids(all_months_data)
+                # Counts keep duplicate rows within a month
+                month_id_counts = [Counter(emp_ids) for emp_ids in month_emp_ids]
+
+            ids_set = {id_str.strip() for id_str in str(emp_id).split('|')} if emp_id else set()
 
             month_ids = {}
-            for m_idx, month_data in enumerate(all_months_data):
-                month_label = month_labels[m_idx] if m_idx < len(month_labels) else f'M{m_idx+1}'
+            for month_label, id_counts in zip(labels, month_id_counts):
                 found_ids = []
-                for monthly_emp in month_data:
-                    m_id = monthly_emp.get('emp_id', '').strip()
-                    if m_id in ids_list:
-                        found_ids.append(m_id)
+                for m_id in ids_set:
+                    found_ids.extend([m_id] * id_counts.get(m_id, 0))
                 month_ids[month_label] = ' | '.join(sorted(found_ids)) if found_ids else '-'
 
             # Determine merge type from merge_reasons
@@ -504,8 +614,7 @@ def create_merged_names_sheet(
                 'Merge Type': merge_type,
             }
 
-            for m_idx in range(len(all_months_data)):
-                month_label = month_labels[m_idx] if m_idx < len(month_labels) else f'M{m_idx+1}'
+            for month_label in labels:
                 row[month_label] = month_ids.get(month_label, '-')
 
             merged_list.append(row)
@@ -516,20 +625,120 @@ def create_merged_names_sheet(
             'Original Names': '',
             'Merge Type': '',
         }
-        for m_idx in range(len(all_months_data)):
-            month_label = month_labels[m_idx] if m_idx < len(month_labels) else f'M{m_idx+1}'
+        for month_label in labels:
             row[month_label] = ''
         merged_list.append(row)
 
     return pd.DataFrame(merged_list)
 
 
+def _sheet_rows(df: pd.DataFrame) -> List[List[Any]]:
+    """
+    Get header and body values as pandas' to_excel would write them.
+
+    Args:
+        df: Sheet DataFrame
+
+    Returns:
+        List of rows (header first); empty if the DataFrame has no columns
+    """
+    if df.columns.empty:
+        return []
+
+    # Missing values are written as empty cells (to_excel's na_rep='')
+    body = df.astype(object).where(df.notna(), '')
+    return [list(df.columns)] + body.values.tolist()
+
+
+def _row_styles(sheet_name: str, row_idx: int, values: List[Any]) -> List[Tuple[Any, Any, Any]]:
+    """
+    Pick the style of each cell in one row.
+
+    Args:
+        sheet_name: Name of the sheet being written
+        row_idx: 0-based row index (0 = header)
+        values: Cell values of the row, in column order
+
+    Returns:
+        (alignment, font, fill) per cell
+    """
+    # Style Executive Summary (header row included)
+    if sheet_name == 'Executive Summary':
+        return [
+            _SECTION_HEADER_STYLE if value and '[' in str(value) and ']' in str(value)
+            else _LEFT_REGULAR_STYLE
+            for value in values
+        ]
+
+    # Data Traceback and Employees keep to_excel's header font and the
+    # default font below it
+    if sheet_name not in ('Suspicious', 'Merged Names', 'Master Match'):
+        return [_TO_EXCEL_HEADER_STYLE if row_idx == 0 else _CENTER_STYLE] * len(values)
+
+    if row_idx == 0:
+        return [_HEADER_STYLE if value else _TO_EXCEL_HEADER_STYLE for value in values]
+
+    # Style Suspicious sheet
+    if sheet_name == 'Suspicious':
+        return [
+            _WARNING_STYLE if '⚠ YES' in str(value or '') else _CENTER_REGULAR_STYLE
+            for value in values
+        ]
+
+    # Style Merged Names sheet
+    if sheet_name == 'Merged Names':
+        if len(values) > 1 and '|' in str(values[1] or ''):
+            # Columns after Original Names keep the regular font
+            return [_RED_BOLD_ROW_STYLE] * min(len(values), 2) + [_RED_ROW_STYLE] * (len(values) - 2)
+        return [_CENTER_REGULAR_STYLE] * len(values)
+
+    # Style Master Match sheet
+    match_type = values[4] if len(values) > 4 else None  # Match Type column
+    return [_MATCH_TYPE_STYLES.get(match_type, _CENTER_REGULAR_STYLE)] * len(values)
+
+
+def write_sheet(wb: Workbook, sheet_name: str, df: pd.DataFrame) -> None:
+    """
+    Write a DataFrame to a new write-only sheet, sized and styled as it streams.
+
+    Column widths are computed from the values up front, since a write-only
+    sheet cannot be revisited after rows are appended.
+
+    Args:
+        wb: Write-only workbook
+        sheet_name: Name of the sheet to create
+        df: Data to write (header row + one row per record)
+    """
+    ws = wb.create_sheet(sheet_name)
+    rows = _sheet_rows(df)
+
+    # Auto-adjust column widths (an empty cell measures as 'None', as the
+    # cell-by-cell width pass over a to_excel sheet did)
+    for col_idx, column in enumerate(zip(*rows), 1):
+        max_length = max(len(str(value)) if value != '' else 4 for value in column)
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+
+    for row_idx, values in enumerate(rows):
+        cells = []
+        for value, (alignment, font, fill) in zip(values, _row_styles(sheet_name, row_idx, values)):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = alignment
+            if font is not None:
+                cell.font = font
+            if fill is not None:
+                cell.fill = fill
+            if row_idx == 0:
+                cell.border = _HEADER_BORDER
+            cells.append(cell)
+        ws.append(cells)
+
+
 def export_to_excel(
     df: pd.DataFrame,
     summary_df: pd.DataFrame,
     aggregated_data: List[Dict[str, Any]],
     all_months_data: List[List[Dict[str, Any]]],
-    match_audit: Optional[List[Dict[str, Any]]] = None,
+    match_audit: Optional[List[MatchAudit]] = None,
     filename: str = 'absence-summary-2568.xlsx'
 ) -> None:
     """
@@ -543,126 +752,40 @@ def export_to_excel(
         match_audit: Master matching audit trail
         filename: Output filename
     """
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Create suspicious sheet first (needed for executive summary)
-        suspicious_df = create_suspicious_sheet(df)
-
-        # Write executive summary (FIRST sheet for CEO view)
-        executive_df = create_executive_summary(aggregated_data, suspicious_df, all_months_data)
-        executive_df.to_excel(writer, sheet_name='Executive Summary', index=False)
-
-        # Write suspicious records
-        suspicious_df.to_excel(writer, sheet_name='Suspicious', index=False)
-
-        # Write master match audit sheet (if available)
-        if match_audit:
-            master_match_df = create_master_match_sheet(match_audit, all_months_data)
-            master_match_df.to_excel(writer, sheet_name='Master Match', index=False)
-
-        # Write merged names sheet
-        merged_names_df = create_merged_names_sheet(df, aggregated_data, all_months_data)
-        merged_names_df.to_excel(writer, sheet_name='Merged Names', index=False)
-
-        # Write data traceback sheet
-        summary_df.to_excel(writer, sheet_name='Data Traceback', index=False)
-
-        # Write detailed data
-        df.to_excel(writer, sheet_name='Employees', index=False)
-
-        # Auto-adjust column widths and style
-        for sheet_name in writer.sheets:
-            ws = writer.sheets[sheet_name]
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-
-                for cell in column:
-                    if sheet_name == 'Executive Summary':
-                        cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-                    else:
-                        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-
-            # Style Executive Summary
-            if sheet_name == 'Executive Summary':
-                section_header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-                section_header_font = Font(bold=True, size=12, color='000000')
-                regular_font = Font(size=11)
-
-                for row_idx, row in enumerate(ws.iter_rows(min_row=1), 1):
-                    for cell in row:
-                        cell.font = regular_font
-                        if cell.value and '[' in str(cell.value) and ']' in str(cell.value):
-                            cell.font = section_header_font
-                            cell.fill = section_header_fill
-
-            # Style Suspicious sheet
-            elif sheet_name == 'Suspicious':
-                bold_font = Font(bold=True, size=12)
-                red_bold_font = Font(color='FF0000', bold=True, size=12)
-
-                for cell in ws[1]:
-                    if cell.value:
-                        cell.font = bold_font
-
-                for row in ws.iter_rows(min_row=2):
-                    for cell in row:
-                        cell.font = Font(size=11)
-                        if '⚠ YES' in str(cell.value or ''):
-                            cell.font = red_bold_font
-
-            # Style Merged Names sheet
-            elif sheet_name == 'Merged Names':
-                bold_font = Font(bold=True, size=12)
-                orange_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-
-                for cell in ws[1]:
-                    if cell.value:
-                        cell.font = bold_font
-
-                for row in ws.iter_rows(min_row=2):
-                    for cell in row:
-                        cell.font = Font(size=11)
-                        if cell.column == 2 and '|' in str(cell.value or ''):
-                            row_cells = ws[cell.row]
-                            for c in row_cells:
-                                c.fill = orange_fill
-                                c.font = Font(bold=True, size=11)
-
-            # Style Master Match sheet
-            elif sheet_name == 'Master Match':
-                bold_font = Font(bold=True, size=12)
-                green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                yellow_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-                red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-
-                for cell in ws[1]:
-                    if cell.value:
-                        cell.font = bold_font
-
-                for row in ws.iter_rows(min_row=2):
-                    match_type_cell = row[4] if len(row) > 4 else None  # Match Type column
-                    confidence_cell = row[5] if len(row) > 5 else None  # Confidence column
-
-                    for cell in row:
-                        cell.font = Font(size=11)
-
-                    if match_type_cell and match_type_cell.value:
-                        if match_type_cell.value == 'UNMATCHED':
-                            for c in row:
-                                c.fill = red_fill
-                        elif match_type_cell.value == 'Fuzzy':
-                            for c in row:
-                                c.fill = yellow_fill
-                        elif match_type_cell.value in ('ID', 'Name'):
-                            for c in row:
-                                c.fill = green_fill
+    wb = Workbook(write_only=True)
+
+    # Stripped IDs of all monthly records, shared by the audit sheets
+    month_emp_ids = month_employee_ids(all_months_data)
+
+    # Create suspicious sheet first (needed for executive summary)
+    suspicious_df = create_suspicious_sheet(df)
+
+    # Write executive summary (FIRST sheet for CEO view)
+    executive_df = create_executive_summary(aggregated_data, suspicious_df, all_months_data)
+    write_sheet(wb, 'Executive Summary', executive_df)
+
+    # Write suspicious records
+    write_sheet(wb, 'Suspicious', suspicious_df)
+
+    # Write master match audit sheet (if available)
+    if match_audit:
+        master_match_df = create_master_match_sheet(
+            match_audit, all_months_data, month_emp_ids=month_emp_ids
+        )
+        write_sheet(wb, 'Master Match', master_match_df)
+
+    # Write merged names sheet
+    merged_names_df = create_merged_names_sheet(
+        df, aggregated_data, all_months_data, month_emp_ids=month_emp_ids
+    )
+    write_sheet(wb, 'Merged Names', merged_names_df)
+
+    # Write data traceback sheet
+    write_sheet(wb, 'Data Traceback', summary_df)
+
+    # Write detailed data
+    write_sheet(wb, 'Employees', df)
+
+    wb.save(filename)
 
     print(f'Exported to {filename}')
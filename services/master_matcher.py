@@ -5,56 +5,112 @@ Matches aggregated employee data against the official employee_master.xlsx
 to ensure consistent IDs and names in the output.
 """
 
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from difflib import SequenceMatcher
 
+from file_io.excel_reader import clean_text_column
 from models.employee import extract_name_key_and_notes
 
+# Aggregated-record fields a merged master group keeps from its first
+# record; IDs, names, notes and totals are rebuilt from the whole group
+_MERGE_KEEP_KEYS = ('name_key', 'position', 'department', 'payType')
+
+# One match audit entry per aggregated record (kept compact: there is one
+# for every employee in the run)
+MatchAudit = namedtuple(
+    'MatchAudit',
+    'master_id master_name original_id original_name original_notes match_type confidence'
+)
+
+# Name similarity an ID match needs to be accepted (IDs get reused)
+_ID_NAME_MIN_SIMILARITY = 0.85
+
 
 def load_employee_master(filepath: str = 'employee_master.xlsx') -> pd.DataFrame:
     """
     Load the employee master file.
 
+    Args:
+        filepath: Path to the employee master file
+
     Returns:
-        DataFrame with columns: emp_id, full_name, name_key
+        DataFrame with columns: master_id, master_name, master_display, name_key
     """
-    df = pd.read_excel(filepath, skiprows=1)
-    df.columns = ['ลำดับ', 'รหัส', 'ชื่อ-นามสกุล', 'จำนวนเงิน', 'ลงชื่อ']
-
-    # Clean and extract key fields
-    master_records = []
-    for _, row in df.iterrows():
-        emp_id = str(row['รหัส']).strip() if pd.notna(row['รหัส']) else ''
-        full_name = str(row['ชื่อ-นามสกุล']).strip() if pd.notna(row['ชื่อ-นามสกุล']) else ''
+    # Only the ID and name columns are used
+    # (columns: ลำดับ, รหัส, ชื่อ-นามสกุล, จำนวนเงิน, ลงชื่อ)
+    df = pd.read_excel(filepath, skiprows=1, usecols=[1, 2], names=['รหัส', 'ชื่อ-นามสกุล'])
 
-        if not emp_id or not full_name:
-            continue
+    # Clean key fields the same way the monthly readers clean IDs, so a
+    # numeric ID converts to the same text on both sides; then drop rows
+    # missing either one
+    df = pd.DataFrame({col: clean_text_column(df[col]) for col in df.columns})
+    df = df[(df['รหัส'] != '') & (df['ชื่อ-นามสกุล'] != '')]
+    emp_ids = df['รหัส'].tolist()
+    full_names = df['ชื่อ-นามสกุล'].tolist()
 
-        # Extract name key for matching
-        name_key, display_name, _ = extract_name_key_and_notes(full_name)
+    # Extract name key for matching (one pass over the names)
+    parsed = [extract_name_key_and_notes(name) for name in full_names]
 
-        master_records.append({
-            'master_id': emp_id,
-            'master_name': full_name,
-            'master_display': display_name,
-            'name_key': name_key
-        })
-
-    return pd.DataFrame(master_records)
+    return pd.DataFrame({
+        'master_id': emp_ids,
+        'master_name': full_names,
+        'master_display': [display_name for _, display_name, _ in parsed],
+        'name_key': [name_key for name_key, _, _ in parsed]
+    })
 
 
 def similarity_ratio(a: str, b: str) -> float:
     """Calculate similarity ratio between two strings."""
     if not a or not b:
         return 0.0
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    return _ratio_cached(a.lower(), b.lower())
+
+
+@lru_cache(maxsize=100_000)
+def _ratio_cached(a: str, b: str) -> float:
+    """Ratio of two lowercased strings; cached since the same name pairs recur."""
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def build_master_indexes(master_df: pd.DataFrame) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+    """
+    Index master rows by ID and by name key for constant-time lookups.
+
+    Args:
+        master_df: DataFrame from load_employee_master
+
+    Returns:
+        Tuple of (id_index, name_index), each mapping a value to the list
+        of master rows (dicts) that have it
+    """
+    id_index = defaultdict(list)
+    name_index = defaultdict(list)
+    for master_id, master_name, master_display, name_key in master_df[
+        ['master_id', 'master_name', 'master_display', 'name_key']
+    ].itertuples(index=False, name=None):
+        row = {
+            'master_id': master_id,
+            'master_name': master_name,
+            'master_display': master_display,
+            'name_key': name_key,
+            # Lowercased once here instead of on every similarity check
+            'name_key_lc': name_key.lower()
+        }
+        id_index[master_id].append(row)
+        name_index[name_key].append(row)
+    return dict(id_index), dict(name_index)
 
 
 def find_best_match(
     name_key: str,
     emp_id: str,
-    master_df: pd.DataFrame,
+    id_index: Dict[str, List[Dict]],
+    name_index: Dict[str, List[Dict]],
     threshold: float = 0.75
 ) -> Optional[Dict]:
     """
@@ -67,6 +123,13 @@ def find_best_match(
     1. ID match WITH name verification (ID matches AND name similarity >= 85%)
     2. Exact name_key match (for employees whose IDs changed)
 
+    Args:
+        name_key: Name key of the aggregated record
+        emp_id: Employee ID of the record (may be pipe-separated)
+        id_index: Master rows by ID, from build_master_indexes
+        name_index: Master rows by name key, from build_master_indexes
+        threshold: Minimum similarity for fuzzy matching
+
     Returns:
         Dict with master_id, master_name, master_display, match_type, confidence
         or None if no match found
@@ -74,16 +137,27 @@ def find_best_match(
     # Try ID match WITH name verification
     # IDs can be reused for different people, so we must check name too
     if emp_id and name_key:
-        id_parts = [id_str.strip() for id_str in emp_id.split('|')]
+        name_key_lc = name_key.lower()
+        # Most records carry a single ID; only split pipe-joined ones
+        if '|' not in emp_id:
+            id_parts = (emp_id.strip(),)
+        else:
+            id_parts = [id_str.strip() for id_str in emp_id.split('|')]
         for single_id in id_parts:
             if not single_id:
                 continue
-            id_matches = master_df[master_df['master_id'] == single_id]
+            id_matches = id_index.get(single_id, ())
             if len(id_matches) == 1:
-                row = id_matches.iloc[0]
+                row = id_matches[0]
+                master_key_lc = row['name_key_lc']
+                # A ratio is at most 2*shorter/(combined length), so names
+                # too different in length can't pass - skip the comparison
+                shorter = min(len(name_key_lc), len(master_key_lc))
+                if 2.0 * shorter / (len(name_key_lc) + len(master_key_lc)) < _ID_NAME_MIN_SIMILARITY:
+                    continue
                 # Verify name similarity to prevent wrong merges
-                name_sim = similarity_ratio(name_key, row['name_key'])
-                if name_sim >= 0.85:  # Name must be at least 85% similar
+                name_sim = _ratio_cached(name_key_lc, master_key_lc)
+                if name_sim >= _ID_NAME_MIN_SIMILARITY:
                     return {
                         'master_id': row['master_id'],
                         'master_name': row['master_name'],
@@ -95,9 +169,9 @@ def find_best_match(
 
     # Try exact name_key match (for employees whose IDs may have changed)
     if name_key:
-        name_matches = master_df[master_df['name_key'] == name_key]
+        name_matches = name_index.get(name_key, ())
         if len(name_matches) == 1:
-            row = name_matches.iloc[0]
+            row = name_matches[0]
             return {
                 'master_id': row['master_id'],
                 'master_name': row['master_name'],
@@ -109,11 +183,17 @@ def find_best_match(
     return None
 
 
+def _split_joined(value: str) -> List[str]:
+    """Split a ' | '-joined field into its non-empty, stripped parts."""
+    return [part for part in map(str.strip, value.split(' | ')) if part]
+
+
 def apply_master_data(
     aggregated_data: List[Dict],
     master_filepath: str = 'employee_master.xlsx',
-    threshold: float = 0.75
-) -> Tuple[List[Dict], List[Dict]]:
+    threshold: float = 0.75,
+    master_df: Optional[pd.DataFrame] = None
+) -> Tuple[List[Dict], List[MatchAudit]]:
     """
     Apply master employee data to aggregated records.
 
@@ -126,15 +206,19 @@ def apply_master_data(
         aggregated_data: List of employee dicts from aggregation
         master_filepath: Path to employee master file
         threshold: Minimum similarity for fuzzy matching
+        master_df: Master data already loaded with load_employee_master
+            (default: load it from master_filepath)
 
     Returns:
         Tuple of (updated_data, match_audit)
         - updated_data: Merged records with master IDs/names applied
-        - match_audit: List of match details for traceability
+        - match_audit: List of MatchAudit entries for traceability
     """
-    # Load master data
-    master_df = load_employee_master(master_filepath)
+    # Load master data (unless the caller already has it)
+    if master_df is None:
+        master_df = load_employee_master(master_filepath)
     print(f'  Loaded {len(master_df)} employees from master file')
+    id_index, name_index = build_master_indexes(master_df)
 
     # First pass: match each record to master
     match_audit = []
@@ -148,21 +232,21 @@ def apply_master_data(
         notes = emp.get('notes', '') or ''
 
         # Find best match
-        match = find_best_match(name_key, original_id, master_df, threshold)
+        match = find_best_match(name_key, original_id, id_index, name_index, threshold)
 
         if match:
             master_id = match['master_id']
 
             # Add to audit
-            match_audit.append({
-                'master_id': master_id,
-                'master_name': match['master_name'],
-                'original_id': original_id,
-                'original_name': original_name,
-                'original_notes': notes,
-                'match_type': match['match_type'],
-                'confidence': match['confidence']
-            })
+            match_audit.append(MatchAudit(
+                master_id=master_id,
+                master_name=match['master_name'],
+                original_id=original_id,
+                original_name=original_name,
+                original_notes=notes,
+                match_type=match['match_type'],
+                confidence=match['confidence']
+            ))
 
             # Group by master_id for merging
             if master_id not in matched_records:
@@ -175,15 +259,15 @@ def apply_master_data(
             matched_records[master_id]['records'].append(emp)
         else:
             # Unmatched - keep original
-            match_audit.append({
-                'master_id': '',
-                'master_name': '',
-                'original_id': original_id,
-                'original_name': original_name,
-                'original_notes': notes,
-                'match_type': 'UNMATCHED',
-                'confidence': 0.0
-            })
+            match_audit.append(MatchAudit(
+                master_id='',
+                master_name='',
+                original_id=original_id,
+                original_name=original_name,
+                original_notes=notes,
+                match_type='UNMATCHED',
+                confidence=0.0
+            ))
             unmatched_records.append(emp)
 
     # Second pass: merge records with same master_id
@@ -196,44 +280,35 @@ def apply_master_data(
             # Single record - just update with master info
             merged = records[0].copy()
         else:
-            # Multiple records - merge them
-            merged = records[0].copy()
+            # Multiple records - merge them; only the fields that survive
+            # merging are taken from the first record
+            first = records[0]
+            merged = {key: first[key] for key in _MERGE_KEEP_KEYS}
             merged['original_names'] = set()
             merged['notes'] = set()
             merged['merge_reasons'] = set()
-            merged['totals'] = [0.0] * 17
 
             for rec in records:
                 # Collect original names
                 orig_names = rec.get('original_names', '')
                 if orig_names:
-                    if isinstance(orig_names, set):
-                        merged['original_names'].update(orig_names)
-                    else:
-                        for n in orig_names.split(' | '):
-                            if n.strip():
-                                merged['original_names'].add(n.strip())
+                    merged['original_names'].update(_split_joined(orig_names))
                 else:
                     merged['original_names'].add(rec.get('name', ''))
 
                 # Collect notes
                 notes = rec.get('notes', '')
                 if notes:
-                    if isinstance(notes, set):
-                        merged['notes'].update(notes)
-                    else:
-                        for n in notes.split(' | '):
-                            if n.strip():
-                                merged['notes'].add(n.strip())
+                    merged['notes'].update(_split_joined(notes))
 
                 # Track merge reason
                 orig_id = rec.get('emp_id', '')
                 orig_name = rec.get('name', '')
                 merged['merge_reasons'].add(f"Master Merge: {orig_id} ({orig_name})")
 
-                # Sum totals
-                for i in range(17):
-                    merged['totals'][i] += rec['totals'][i]
+            # Sum totals across the group in one array reduction
+            totals = np.asarray([rec['totals'] for rec in records], dtype=np.float64)
+            merged['totals'] = totals.sum(axis=0).tolist()
 
             # Convert sets to strings
             merged['original_names'] = ' | '.join(sorted(merged['original_names']))
@@ -255,28 +330,24 @@ def apply_master_data(
 
     # Fix duplicate IDs: add suffix for unmatched employees with same ID
     # This happens when the same ID was reused for different people
-    id_counts = {}
-    for emp in updated_data:
-        emp_id = emp.get('emp_id', '')
-        if emp_id:
-            id_counts[emp_id] = id_counts.get(emp_id, 0) + 1
+    id_counts = Counter(emp['emp_id'] for emp in updated_data if emp.get('emp_id', ''))
 
     # Find IDs that appear more than once
     duplicate_ids = {emp_id for emp_id, count in id_counts.items() if count > 1}
 
     if duplicate_ids:
         # Add suffix to duplicates (keep first occurrence as-is, add -A, -B, etc. to others)
-        id_suffix_counters = {emp_id: 0 for emp_id in duplicate_ids}
+        seen = defaultdict(int)
 
         for emp in updated_data:
             emp_id = emp.get('emp_id', '')
             if emp_id in duplicate_ids:
-                count = id_suffix_counters[emp_id]
+                count = seen[emp_id]
                 if count > 0:
                     # Add suffix: -A, -B, -C, etc.
                     suffix = chr(ord('A') + count - 1)
                     emp['emp_id'] = f"{emp_id}-{suffix}"
-                id_suffix_counters[emp_id] += 1
+                seen[emp_id] += 1
 
         print(f'  Fixed {len(duplicate_ids)} duplicate IDs with suffixes')
 
@@ -294,11 +365,11 @@ def apply_master_data(
     return updated_data, match_audit
 
 
-def get_unmatched_employees(match_audit: List[Dict]) -> List[Dict]:
+def get_unmatched_employees(match_audit: List[MatchAudit]) -> List[MatchAudit]:
     """Get list of employees that couldn't be matched to master."""
-    return [m for m in match_audit if m['match_type'] == 'UNMATCHED']
+    return [m for m in match_audit if m.match_type == 'UNMATCHED']
 
 
-def get_fuzzy_matches(match_audit: List[Dict]) -> List[Dict]:
+def get_fuzzy_matches(match_audit: List[MatchAudit]) -> List[MatchAudit]:
     """Get list of fuzzy matches for review."""
-    return [m for m in match_audit if m['match_type'] == 'Fuzzy']
+    return [m for m in match_audit if m.match_type == 'Fuzzy']
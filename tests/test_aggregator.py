@@ -0,0 +1,90 @@
+"""
+Yearly aggregation folded month by month (services.aggregator).
+"""
+
+import unittest
+
+from services.aggregator import aggregate_yearly_totals, finalize_aggregation, fold_month
+
+
+def _record(emp_id: str, name_key: str, display_name: str, work_days: float, note: str = '') -> dict:
+    """Build a monthly record as the format handlers return it."""
+    return {
+        'primary_key': name_key,
+        'name_key': name_key,
+        'emp_id': emp_id,
+        'nickname': '',
+        'display_name': display_name,
+        'note': note,
+        'position': 'พนักงาน',
+        'department': 'ผลิต',
+        'payType': 'รายวัน',
+        'totals': [work_days] + [0.0] * 16,
+    }
+
+
+def _months() -> list:
+    """Two months covering ID merges, a reused ID, a new ID and name-only records."""
+    return [
+        [
+            _record('1001', 'สมชายใจดี', 'นาย สมชาย ใจดี', 20.0),
+            _record('1002', 'มานะขยัน', 'นาย มานะ ขยัน', 18.0),
+            _record('', 'สมหญิงรักดี', 'นางสาว สมหญิง รักดี', 10.0),
+        ],
+        [
+            _record('1001', 'สมชายใจดี', 'นาย สมชาย ใจดี', 21.0, note='ลาออก'),
+            # Reused ID: a different person
+            _record('1002', 'ปรีชาสุขใจ', 'นาย ปรีชา สุขใจ', 5.0),
+            # Same name under a new ID
+            _record('2002', 'มานะขยัน', 'นาย มานะ ขยัน', 3.0),
+            _record('', 'สมหญิงรักดี', 'นางสาว สมหญิง รักดี', 11.0),
+        ],
+    ]
+
+
+class FoldMonthTest(unittest.TestCase):
+    """Folding months one at a time, then finalizing once."""
+
+    def setUp(self):
+        id_map, name_map = {}, {}
+        for month in _months():
+            fold_month(id_map, name_map, month)
+        self.result = finalize_aggregation(id_map, name_map)
+        self.by_name = {emp['name']: emp for emp in self.result}
+
+    def test_same_as_aggregate_yearly_totals(self):
+        self.assertEqual(self.result, aggregate_yearly_totals(_months()))
+
+    def test_merges(self):
+        self.assertEqual(len(self.result), 4)
+
+        somchai = self.by_name['นาย สมชาย ใจดี']
+        self.assertEqual(somchai['emp_id'], '1001')
+        self.assertEqual(somchai['totals'][0], 41.0)
+        self.assertEqual(somchai['notes'], 'ลาออก')
+
+        # Same name under two IDs becomes one record
+        mana = self.by_name['นาย มานะ ขยัน']
+        self.assertEqual(mana['emp_id'], '1002 | 2002')
+        self.assertEqual(mana['totals'][0], 21.0)
+
+        # Reused ID with a different name stays separate, keeping the ID
+        preecha = self.by_name['นาย ปรีชา สุขใจ']
+        self.assertEqual(preecha['emp_id'], '1002')
+        self.assertEqual(preecha['totals'][0], 5.0)
+
+        # Records without ID are aggregated by name key
+        somying = self.by_name['นางสาว สมหญิง รักดี']
+        self.assertEqual(somying['emp_id'], '')
+        self.assertEqual(somying['totals'][0], 21.0)
+
+    def test_output_types(self):
+        for emp in self.result:
+            self.assertIsInstance(emp['totals'], list)
+            self.assertIsInstance(emp['notes'], str)
+            self.assertIsInstance(emp['original_names'], str)
+            self.assertIsInstance(emp['merge_reasons'], str)
+
+
+if __name__ == '__main__':
+    unittest.main()
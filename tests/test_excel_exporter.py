@@ -0,0 +1,100 @@
+"""
+Workbook written by services.excel_exporter.export_to_excel.
+"""
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from services.excel_exporter import create_output_dataframe, export_to_excel
+
+
+def _employee(emp_id: str, name: str, notes: str) -> dict:
+    """Build a minimal aggregated employee record."""
+    return {
+        'emp_id': emp_id,
+        'name': name,
+        'notes': notes,
+        'position': 'พนักงาน',
+        'department': 'ผลิต',
+        'payType': 'รายวัน',
+        'totals': [20.0] + [0.0] * 16,
+        'original_names': name,
+        'merge_reasons': '',
+    }
+
+
+class ExportToExcelTest(unittest.TestCase):
+    """Sheets, header formatting, row styles and column widths."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'summary.xlsx')
+
+        aggregated = [
+            _employee('1001', 'นาย สมชาย ใจดี', ''),
+            _employee('1002', 'นาย มานะ ขยัน', 'ลาออก 15/03'),
+        ]
+        summary_df = pd.DataFrame([{'File': '01.2568.xlsx', 'Section': 'All', 'Work Days': 40.0, 'OT': None}])
+        months = [[{'emp_id': '1001', 'totals': [20.0] + [0.0] * 16}]]
+
+        export_to_excel(
+            create_output_dataframe(aggregated), summary_df, aggregated, months,
+            filename=self.path
+        )
+        self.wb = load_workbook(self.path)
+
+    def tearDown(self):
+        self.wb.close()
+        self._tmp.cleanup()
+
+    def test_sheet_names(self):
+        # No match audit, so no Master Match sheet
+        self.assertEqual(
+            self.wb.sheetnames,
+            ['Executive Summary', 'Suspicious', 'Merged Names', 'Data Traceback', 'Employees']
+        )
+
+    def test_header_row(self):
+        ws = self.wb['Employees']
+        header = [cell.value for cell in ws[1]]
+        self.assertEqual(header[:4], ['รหัส (EmpID)', 'ชื่อ-สกุล (Name)', 'ชื่อเต็ม (Master)', 'หมายเหตุ (Notes)'])
+        self.assertEqual(len(header), 7 + 17)
+        for cell in ws[1]:
+            self.assertTrue(cell.font.bold)
+            self.assertEqual(cell.border.left.style, 'thin')
+            self.assertEqual(cell.border.bottom.style, 'thin')
+
+    def test_suspicious_row_styles(self):
+        ws = self.wb['Suspicious']
+        header = [cell.value for cell in ws[1]]
+        row = ws[2]
+        self.assertEqual(ws.max_row, 2)  # Only the employee who quit
+        self.assertEqual(row[0].value, '1002')
+
+        quit_cell = row[header.index('Quit (ลาออก)?')]
+        self.assertEqual(quit_cell.value, '⚠ YES')
+        self.assertTrue(quit_cell.font.bold)
+        self.assertEqual(quit_cell.font.color.rgb, '00FF0000')
+
+        id_cell = row[0]
+        self.assertFalse(id_cell.font.bold)
+        self.assertEqual(id_cell.font.sz, 11)
+        self.assertEqual(id_cell.alignment.horizontal, 'center')
+
+    def test_column_widths(self):
+        ws = self.wb['Data Traceback']
+        # Longest value (header included) + 2
+        self.assertEqual(ws.column_dimensions['A'].width, len('01.2568.xlsx') + 2)
+        self.assertEqual(ws.column_dimensions['B'].width, len('Section') + 2)
+        self.assertEqual(ws.column_dimensions['C'].width, len('Work Days') + 2)
+
+        # An empty cell measures as 4 characters
+        self.assertEqual(ws.column_dimensions['D'].width, 4 + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
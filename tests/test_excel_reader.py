@@ -0,0 +1,71 @@
+"""
+Sheet loading and vectorized cell parsing in file_io.excel_reader.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from file_io import excel_reader
+from file_io.excel_reader import load_excel_file, parse_columns, parse_value
+
+
+class LoadExcelFileTest(unittest.TestCase):
+    """Columns keep their sheet positions as labels, also with usecols."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'sheet.xlsx')
+        # 3 title rows, header, 2 data rows, 5 columns
+        sheet = [['title'] + [None] * 4 for _ in range(3)]
+        sheet.append([f'col {c}' for c in range(5)])
+        sheet.append([10, 11, 12, 13, 14])
+        sheet.append([20, 21, 22, 23, 24])
+        pd.DataFrame(sheet).to_excel(self.path, index=False, header=False)
+        self._engine = excel_reader._EXCEL_ENGINE
+
+    def tearDown(self):
+        excel_reader._EXCEL_ENGINE = self._engine
+        self._tmp.cleanup()
+
+    def test_usecols_labels_by_position(self):
+        for engine in ('openpyxl', 'calamine'):
+            if engine == 'calamine' and self._engine != 'calamine':
+                continue  # python-calamine not installed
+            with self.subTest(engine=engine):
+                excel_reader._EXCEL_ENGINE = engine
+                # Unsorted, with a duplicate
+                df = load_excel_file(self.path, usecols=[3, 1, 3])
+                self.assertEqual(list(df.columns), [1, 3])
+                self.assertEqual(df[1].tolist(), [11, 21])
+                self.assertEqual(df[3].tolist(), [13, 23])
+
+    def test_all_columns(self):
+        df = load_excel_file(self.path)
+        self.assertEqual(list(df.columns), [0, 1, 2, 3, 4])
+        self.assertEqual(df[4].tolist(), [14, 24])
+
+
+class ParseColumnsTest(unittest.TestCase):
+    """parse_columns must give the same numbers as parse_value per cell."""
+
+    def test_text_cells_match_parse_value(self):
+        cells = ['-', ' 3 ', 'abc', '๒', '๑๒.๕', None, '', ' - ', '--', 4.5]
+        df = pd.DataFrame({0: pd.Series(cells, dtype=object)})
+
+        result = parse_columns(df, [0])[:, 0]
+
+        np.testing.assert_array_equal(result, [parse_value(cell) for cell in cells])
+        self.assertEqual(result[3], 2.0)  # Thai digit
+        self.assertEqual(result[4], 12.5)
+
+    def test_numeric_column(self):
+        df = pd.DataFrame({0: [1.0, np.nan, 2.5]})
+        np.testing.assert_array_equal(parse_columns(df, [0])[:, 0], [1.0, 0.0, 2.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
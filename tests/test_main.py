@@ -0,0 +1,44 @@
+"""
+Section totals for the Data Traceback sheet (main.extract_section_data).
+"""
+
+import unittest
+
+import pandas as pd
+
+from main import extract_section_data
+
+
+def _format_a_sheet(rows: list) -> pd.DataFrame:
+    """Build a Format A sheet as load_excel_file returns it (39 columns by position)."""
+    sheet = []
+    for name, half1, half2 in rows:
+        sheet.append(['1001', name, 'พนักงาน', 'ผลิต', 'รายวัน'] + half1 + half2)
+    return pd.DataFrame(sheet, columns=range(39))
+
+
+class ExtractSectionDataTest(unittest.TestCase):
+    """Each half is summed over the rows that have a name."""
+
+    def test_format_a_halves(self):
+        df = _format_a_sheet([
+            ('นายสมชาย ใจดี', [10] + [1] * 16, [12] + [0] * 16),
+            ('นายมานะ ขยัน', ['-'] + [2] * 16, [8] + [None] * 16),
+            (None, [100] * 17, [100] * 17),  # Blank name
+            ('   ', [100] * 17, [100] * 17),  # Whitespace-only name
+        ])
+
+        result = extract_section_data(df, 'A')
+
+        self.assertEqual(result['sections'], ['First Half', 'Second Half'])
+        self.assertEqual(result['section0'], [10.0] + [3.0] * 16)
+        self.assertEqual(result['section1'], [20.0] + [0.0] * 16)
+
+    def test_formats_without_sections(self):
+        df = _format_a_sheet([('นายสมชาย ใจดี', [1] * 17, [1] * 17)])
+        self.assertIsNone(extract_section_data(df, 'C'))
+        self.assertIsNone(extract_section_data(df, 'D'))
+
+
+if __name__ == '__main__':
+    unittest.main()
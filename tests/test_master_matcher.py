@@ -0,0 +1,79 @@
+"""
+Master matching against monthly files whose employee IDs are numeric.
+"""
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from main import process_file
+from services.aggregator import fold_month, finalize_aggregation
+from services.master_matcher import apply_master_data, load_employee_master
+
+
+def _write_month_11(path: str, rows: list) -> None:
+    """Write a minimal Format D (11.2568.xlsx) sheet: 4 title rows, header, data."""
+    width = 30
+    sheet = [[f'title {i}'] + [None] * (width - 1) for i in range(4)]
+    sheet.append([f'col {c}' for c in range(width)])
+    for seq, (emp_id, name) in enumerate(rows, 1):
+        row = [seq, emp_id, name, 'พนักงาน', 'ผลิต', 'รายวัน', ''] + [0] * (width - 7)
+        row[7] = 20  # Work Days
+        sheet.append(row)
+    pd.DataFrame(sheet).to_excel(path, index=False, header=False)
+
+
+def _write_master(path: str, rows: list) -> None:
+    """Write a minimal employee master: 1 title row, header, data."""
+    sheet = [['รายชื่อพนักงาน', None, None, None, None],
+             ['ลำดับ', 'รหัส', 'ชื่อ-นามสกุล', 'จำนวนเงิน', 'ลงชื่อ']]
+    for seq, (emp_id, name) in enumerate(rows, 1):
+        sheet.append([seq, emp_id, name, 100, None])
+    pd.DataFrame(sheet).to_excel(path, index=False, header=False)
+
+
+class NumericIdMatchTest(unittest.TestCase):
+    """Numeric IDs (with blank cells) must match across monthly and master files."""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_numeric_ids_match_by_id(self):
+        # Blank ID cells make pandas read both ID columns as floats
+        _write_month_11('11.2568.xlsx', [
+            (1001, 'นายสมชาย ใจดี'),
+            (None, 'นางสาวสมหญิง รักดี'),
+            (1003, 'นายมานะ ขยัน'),
+        ])
+        _write_master('employee_master.xlsx', [
+            (1001, 'นายสมชาย ใจดีมาก'),  # Same ID, slightly different name
+            (None, 'นายไม่มี รหัส'),
+            (1003, 'นายมานะ ขยัน'),
+        ])
+
+        employees, _, _ = process_file('11.2568.xlsx')
+        id_map, name_map = {}, {}
+        fold_month(id_map, name_map, employees)
+        aggregated = finalize_aggregation(id_map, name_map)
+
+        master_df = load_employee_master('employee_master.xlsx')
+        updated, audit = apply_master_data(aggregated, master_df=master_df)
+
+        by_name = {m.original_name: m for m in audit}
+        self.assertEqual(by_name['นาย สมชาย ใจดี'].match_type, 'ID+Name')
+        self.assertEqual(by_name['นาย สมชาย ใจดี'].master_id, by_name['นาย สมชาย ใจดี'].original_id)
+        self.assertEqual(by_name['นาย มานะ ขยัน'].match_type, 'ID+Name')
+        self.assertEqual(by_name['นางสาว สมหญิง รักดี'].match_type, 'UNMATCHED')
+        self.assertEqual(len(updated), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()